@@ -21,23 +21,124 @@ Example local.settings.json configuration:
 }
 """
 import azure.functions as func
+import asyncio
+import atexit
+import copy
+import hashlib
 import logging
-import json
+import orjson
 import os
-from typing import Optional
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
 
 try:
-    from openai import AzureOpenAI
+    from openai import AsyncAzureOpenAI
 except ImportError:
     # OpenAI package will be available at runtime after pip install
-    AzureOpenAI = None
+    AsyncAzureOpenAI = None
 
-from shared.storage_utils import get_blob_service_client
+from shared.storage_utils import (
+    get_shared_async_blob_client_from_url,
+    get_shared_async_blob_service_client,
+    parse_blob_range_url,
+    upload_blob_async
+)
 
 # Create the blueprint
 abstract_parse_bp = func.Blueprint()
 
 
+# Shared Azure OpenAI client, built on first use so every invocation reuses one HTTP connection pool
+_openai_client: Optional["AsyncAzureOpenAI"] = None
+_openai_client_lock = threading.Lock()
+
+# Deployment name is fixed for the lifetime of the worker
+AZURE_OPENAI_DEPLOYMENT = os.getenv('AZURE_OPENAI_DEPLOYMENT', 'gpt-4')
+
+
+def _get_openai_client() -> Optional["AsyncAzureOpenAI"]:
+    """
+    Get the shared Azure OpenAI client, creating it once per worker process
+    
+    Returns None (and retries on the next call) while the endpoint or key is not configured.
+    """
+    global _openai_client
+    if _openai_client is not None:
+        return _openai_client
+    
+    with _openai_client_lock:
+        if _openai_client is None:
+            azure_openai_endpoint = os.getenv('AZURE_OPENAI_ENDPOINT')
+            azure_openai_key = os.getenv('AZURE_OPENAI_KEY')
+            
+            if not azure_openai_endpoint or not azure_openai_key or AsyncAzureOpenAI is None:
+                return None
+            
+            _openai_client = AsyncAzureOpenAI(
+                azure_endpoint=azure_openai_endpoint,
+                api_key=azure_openai_key,
+                api_version="2024-02-01"
+            )
+    return _openai_client
+
+
+def _close_openai_client():
+    """
+    Best-effort release of the shared client's connections on worker shutdown
+    """
+    if _openai_client is None:
+        return
+    try:
+        asyncio.run(_openai_client.close())
+    except Exception as e:
+        logging.debug(f"Error closing Azure OpenAI client: {str(e)}")
+
+
+atexit.register(_close_openai_client)
+
+
+class _TTLCache:
+    """
+    Small thread-safe LRU cache whose entries expire after a fixed TTL
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+
+# Recently read article metadata, keyed by file_url
+_metadata_cache = _TTLCache(maxsize=1024, ttl=300)
+# Simplified descriptions, keyed by (file_url, sha256 of the description)
+_simplified_cache = _TTLCache(maxsize=1024, ttl=300)
+
+# Blob container holding simplified descriptions, one blob per description hash
+SIMPLIFIED_CACHE_CONTAINER = "abstract-cache"
+
+
 @abstract_parse_bp.route(route="abstract/simplify", methods=["POST"])
 async def simplify_article_description(req: func.HttpRequest) -> func.HttpResponse:
     """
@@ -60,10 +161,10 @@ async def simplify_article_description(req: func.HttpRequest) -> func.HttpRespon
 
     try:
         # Parse request body
-        req_body = req.get_json()
+        req_body = orjson.loads(req.get_body())
         if not req_body:
             return func.HttpResponse(
-                json.dumps({
+                orjson.dumps({
                     "status": "error",
                     "message": "Request body is required"
                 }),
@@ -74,7 +175,7 @@ async def simplify_article_description(req: func.HttpRequest) -> func.HttpRespon
         file_url = req_body.get('file_url')
         if not file_url:
             return func.HttpResponse(
-                json.dumps({
+                orjson.dumps({
                     "status": "error",
                     "message": "file_url is required in the request body"
                 }),
@@ -85,10 +186,10 @@ async def simplify_article_description(req: func.HttpRequest) -> func.HttpRespon
         logging.info(f'Processing file URL: {file_url}')
         
         # Read article metadata from blob storage
-        article_metadata = read_article_metadata_from_url(file_url)
+        article_metadata = await read_article_metadata_from_url_async(file_url)
         if not article_metadata:
             return func.HttpResponse(
-                json.dumps({
+                orjson.dumps({
                     "status": "error",
                     "message": "Failed to read article metadata from the provided URL"
                 }),
@@ -100,7 +201,7 @@ async def simplify_article_description(req: func.HttpRequest) -> func.HttpRespon
         description = article_metadata.get('description', '')
         if not description:
             return func.HttpResponse(
-                json.dumps({
+                orjson.dumps({
                     "status": "error",
                     "message": "No description found in the article metadata"
                 }),
@@ -108,11 +209,17 @@ async def simplify_article_description(req: func.HttpRequest) -> func.HttpRespon
                 mimetype="application/json"
             )
         
-        # Simplify the description using Azure OpenAI
-        simplified_description = await simplify_text_with_openai(description)
+        # Simplify the description using Azure OpenAI, reusing a recent result if we have one
+        description_hash = hashlib.sha256(description.encode('utf-8')).hexdigest()
+        cache_key = (file_url, description_hash)
+        simplified_description = _simplified_cache.get(cache_key)
+        if not simplified_description:
+            simplified_description = await get_simplified_description(description, description_hash)
+            if simplified_description:
+                _simplified_cache.set(cache_key, simplified_description)
         if not simplified_description:
             return func.HttpResponse(
-                json.dumps({
+                orjson.dumps({
                     "status": "error",
                     "message": "Failed to simplify the description using Azure OpenAI"
                 }),
@@ -122,11 +229,11 @@ async def simplify_article_description(req: func.HttpRequest) -> func.HttpRespon
         
         # Return success response
         return func.HttpResponse(
-            json.dumps({
+            orjson.dumps({
                 "status": "success",
                 "simplified_description": simplified_description,
                 "article_metadata": article_metadata
-            }, ensure_ascii=False),
+            }),
             status_code=200,
             mimetype="application/json"
         )
@@ -134,7 +241,7 @@ async def simplify_article_description(req: func.HttpRequest) -> func.HttpRespon
     except Exception as e:
         logging.error(f"Error in simplify_article_description: {str(e)}")
         return func.HttpResponse(
-            json.dumps({
+            orjson.dumps({
                 "status": "error",
                 "message": f"Internal server error: {str(e)}"
             }),
@@ -143,47 +250,56 @@ async def simplify_article_description(req: func.HttpRequest) -> func.HttpRespon
         )
 
 
-def read_article_metadata_from_url(file_url: str) -> Optional[dict]:
+async def read_article_metadata_from_url_async(file_url: str) -> Optional[dict]:
     """
     Read article metadata from Azure Blob Storage using the provided URL
     
+    Results are kept in a bounded in-memory cache so repeated or retried
+    requests for the same file_url skip the blob download.
+    
     Args:
         file_url: Full URL to the blob containing article metadata JSON
         
     Returns:
         dict: Article metadata or None if failed
     """
+    cached = _metadata_cache.get(file_url)
+    if cached is not None:
+        logging.debug("Using cached article metadata for URL: %s", file_url)
+        return copy.copy(cached)
+    
+    article_metadata = await _download_article_metadata(file_url)
+    if article_metadata is not None:
+        _metadata_cache.set(file_url, article_metadata)
+        return copy.copy(article_metadata)
+    return None
+
+
+async def _download_article_metadata(file_url: str) -> Optional[dict]:
+    """
+    Download and parse article metadata JSON from Azure Blob Storage
+    """
     try:
-        # Parse the blob URL to extract container and blob name
-        # Expected format: https://storageaccount.blob.core.windows.net/container/path/to/blob
-        url_parts = file_url.replace('http://', '').replace('https://', '').split('/')
-        if len(url_parts) < 3:
-            logging.error(f"Invalid blob URL format: {file_url}")
-            return None
-        
-        # Extract container name and blob path
-        container_name = url_parts[1]
-        blob_name = '/'.join(url_parts[2:])
+        # Packed article URLs address a byte range of an NDJSON blob
+        blob_url, offset, length = parse_blob_range_url(file_url)
         
-        logging.info(f"Reading from container: {container_name}, blob: {blob_name}")
+        # Read through the shared client; only the URL's container and blob names are used
+        blob_client = await get_shared_async_blob_client_from_url(blob_url)
+        logging.debug("Reading from container: %s, blob: %s", blob_client.container_name, blob_client.blob_name)
         
-        # Get blob service client using RBAC
-        blob_service_client = get_blob_service_client()
-        
-        # Get blob client
-        blob_client = blob_service_client.get_blob_client(
-            container=container_name, 
-            blob=blob_name
-        )
+        # Download and parse the blob content (only the article's range for packed blobs).
+        # Articles are stored with Content-Encoding: gzip, which the SDK decodes on
+        # download, so gzip and older plain JSON uploads both arrive as plain JSON
+        if offset is not None:
+            blob_data = await blob_client.download_blob(offset=offset, length=length)
+        else:
+            blob_data = await blob_client.download_blob(max_concurrency=4)
+        content = await blob_data.readall()
         
-        # Download and parse the blob content
-        blob_data = blob_client.download_blob()
-        content = blob_data.readall().decode('utf-8')
-
         # Parse JSON content
-        article_metadata = json.loads(content)
+        article_metadata = orjson.loads(content)
         
-        logging.info(f"Successfully read article metadata for: {article_metadata.get('identifier', 'unknown')}")
+        logging.debug("Successfully read article metadata for: %s", article_metadata.get('identifier', 'unknown'))
         return article_metadata
         
     except Exception as e:
@@ -191,39 +307,96 @@ def read_article_metadata_from_url(file_url: str) -> Optional[dict]:
         return None
 
 
-async def simplify_text_with_openai(description: str) -> Optional[str]:
+async def get_simplified_description(description: str, description_hash: str) -> Optional[str]:
     """
-    Use Azure OpenAI to simplify academic text into easy-to-understand language
+    Cache-aside lookup of a simplified description in Azure Blob Storage
+    
+    Checks the abstract-cache container for a previous result before calling
+    Azure OpenAI, and stores new results there for later requests.
     
     Args:
         description: The original academic description/abstract
+        description_hash: sha256 hex digest of the description, used as blob name
         
     Returns:
         str: Simplified description or None if failed
     """
+    blob_name = f"{description_hash}.json"
+    simplified_text = None
+    
     try:
-        # Get Azure OpenAI configuration from environment variables
-        azure_openai_endpoint = os.getenv('AZURE_OPENAI_ENDPOINT')
-        azure_openai_key = os.getenv('AZURE_OPENAI_KEY')
-        azure_openai_deployment = os.getenv('AZURE_OPENAI_DEPLOYMENT', 'gpt-4')
+        # Shared client; it stays open for later requests
+        blob_service_client = await get_shared_async_blob_service_client()
         
-        if not azure_openai_endpoint or not azure_openai_key:
-            logging.error("Azure OpenAI configuration missing. Please set AZURE_OPENAI_ENDPOINT and AZURE_OPENAI_KEY environment variables.")
-            return None
+        # Check for a previously simplified description
+        try:
+            blob_client = blob_service_client.get_blob_client(
+                container=SIMPLIFIED_CACHE_CONTAINER,
+                blob=blob_name
+            )
+            downloader = await blob_client.download_blob()
+            cached = orjson.loads(await downloader.readall())
+            simplified_text = cached.get('simplified_description')
+            if simplified_text:
+                logging.debug("Using cached simplified description: %s", blob_name)
+                return simplified_text
+        except Exception as e:
+            logging.debug("Simplified description cache miss for %s: %s", blob_name, e)
         
-        if AzureOpenAI is None:
-            logging.error("OpenAI package not available. Please install openai package.")
+        simplified_text = await simplify_text_with_openai(description)
+        if not simplified_text:
             return None
         
-        # Initialize Azure OpenAI client
-        client = AzureOpenAI(
-            azure_endpoint=azure_openai_endpoint,
-            api_key=azure_openai_key,
-            api_version="2024-02-01"
-        )
+        # Store the result for later requests; a failed write only costs a future cache miss
+        try:
+            await upload_blob_async(
+                blob_service_client,
+                SIMPLIFIED_CACHE_CONTAINER,
+                blob_name,
+                orjson.dumps({"simplified_description": simplified_text})
+            )
+        except Exception as e:
+            logging.warning(f"Failed to cache simplified description {blob_name}: {str(e)}")
         
-        # Create the prompt for simplification
-        system_prompt = """You are a helpful assistant that specializes in making complex academic and technical content accessible to general audiences.
+        return simplified_text
+    
+    except Exception as e:
+        # Storage is unavailable, so fall back to calling Azure OpenAI directly
+        logging.warning(f"Simplified description cache unavailable: {str(e)}")
+        if simplified_text:
+            return simplified_text
+        return await simplify_text_with_openai(description)
+
+
+async def simplify_text_with_openai(description: str) -> Optional[str]:
+    """
+    Use Azure OpenAI to simplify academic text into easy-to-understand language
+    
+    Concurrent calls on the same worker are coalesced into a single chat
+    completion by the shared batcher.
+    
+    Args:
+        description: The original academic description/abstract
+        
+    Returns:
+        str: Simplified description or None if failed
+    """
+    if AsyncAzureOpenAI is None:
+        logging.error("OpenAI package not available. Please install openai package.")
+        return None
+    
+    if _get_openai_client() is None:
+        logging.error("Azure OpenAI configuration missing. Please set AZURE_OPENAI_ENDPOINT and AZURE_OPENAI_KEY environment variables.")
+        return None
+    
+    return await _simplification_batcher.simplify(description)
+
+
+# Completion budget per simplified description, for single and batched requests alike
+SIMPLIFY_MAX_TOKENS = 1000
+
+# Prompt shared by single and batched simplification requests
+SIMPLIFY_SYSTEM_PROMPT = """You are a helpful assistant that specializes in making complex academic and technical content accessible to general audiences.
 Your task is to take academic abstracts or descriptions and rewrite them in simple, clear language that anyone can understand.
 
 Guidelines:
@@ -235,6 +408,12 @@ Guidelines:
 - Keep the explanation concise but comprehensive
 - The generated answer only contains content and does not require other irrelevant content such as greetings to the user"""
 
+
+async def _request_simplification(description: str) -> Optional[str]:
+    """
+    Simplify a single description with one Azure OpenAI chat completion
+    """
+    try:
         user_prompt = f"""Please simplify the following academic description into easy-to-understand language:
 
 {description}
@@ -242,13 +421,13 @@ Guidelines:
 Rewrite this in simple, clear terms that anyone can understand while preserving the key information and findings."""
 
         # Make API call to Azure OpenAI
-        response = client.chat.completions.create(
-            model=azure_openai_deployment,
+        response = await _get_openai_client().chat.completions.create(
+            model=AZURE_OPENAI_DEPLOYMENT,
             messages=[
-                {"role": "system", "content": system_prompt},
+                {"role": "system", "content": SIMPLIFY_SYSTEM_PROMPT},
                 {"role": "user", "content": user_prompt}
             ],
-            max_tokens=1000,
+            max_tokens=SIMPLIFY_MAX_TOKENS,
             temperature=0.7
         )
         
@@ -266,3 +445,120 @@ Rewrite this in simple, clear terms that anyone can understand while preserving
     except Exception as e:
         logging.error(f"Error simplifying text with Azure OpenAI: {str(e)}")
         return None
+
+
+async def _request_batch_simplification(descriptions: list) -> Optional[list]:
+    """
+    Simplify several descriptions with one Azure OpenAI chat completion
+    
+    Returns:
+        list: One simplified text per description, or None if the response
+        could not be matched back to the inputs
+    """
+    try:
+        numbered = "\n\n".join(
+            f"[{index}]\n{description}" for index, description in enumerate(descriptions, start=1)
+        )
+        user_prompt = f"""Please simplify each of the following {len(descriptions)} numbered academic descriptions into easy-to-understand language.
+
+{numbered}
+
+Respond with only a JSON array of {len(descriptions)} strings, where element i is the simplified version of description [i+1]."""
+
+        response = await _get_openai_client().chat.completions.create(
+            model=AZURE_OPENAI_DEPLOYMENT,
+            messages=[
+                {"role": "system", "content": SIMPLIFY_SYSTEM_PROMPT},
+                {"role": "user", "content": user_prompt}
+            ],
+            # Same budget per description as a single request, so batching never shortens results
+            max_tokens=SIMPLIFY_MAX_TOKENS * len(descriptions),
+            temperature=0.7
+        )
+        
+        content = (response.choices[0].message.content or '').strip()
+        # Tolerate the model wrapping the array in a markdown code fence
+        if content.startswith('```'):
+            content = content.strip('`').removeprefix('json').strip()
+        
+        results = orjson.loads(content)
+        if (not isinstance(results, list) or len(results) != len(descriptions)
+                or not all(isinstance(result, str) and result.strip() for result in results)):
+            logging.warning("Azure OpenAI batch response did not match the requested descriptions")
+            return None
+        
+        logging.info(f"Successfully simplified {len(descriptions)} descriptions in one Azure OpenAI call")
+        return [result.strip() for result in results]
+        
+    except Exception as e:
+        logging.warning(f"Error simplifying batch with Azure OpenAI: {str(e)}")
+        return None
+
+
+class _SimplificationBatcher:
+    """
+    Coalesces simplification requests that arrive within a short window into
+    one chat completion and fans the results back out to the callers
+    
+    All state is touched only from the worker's event loop, so no lock is needed.
+    """
+    
+    def __init__(self, window_seconds: float, max_batch_size: int):
+        self.window_seconds = window_seconds
+        self.max_batch_size = max_batch_size
+        self._pending: list = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        # Strong references so in-flight dispatch tasks are not garbage collected
+        self._dispatch_tasks: set = set()
+    
+    async def simplify(self, description: str) -> Optional[str]:
+        if self.max_batch_size <= 1:
+            return await _request_simplification(description)
+        
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((description, future))
+        
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.window_seconds, self._flush)
+        
+        return await future
+    
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.get_running_loop().create_task(self._dispatch(batch))
+            self._dispatch_tasks.add(task)
+            task.add_done_callback(self._dispatch_tasks.discard)
+    
+    async def _dispatch(self, batch: list) -> None:
+        descriptions = [description for description, _ in batch]
+        try:
+            results = None
+            if len(batch) > 1:
+                results = await _request_batch_simplification(descriptions)
+            if results is None:
+                # Single request, or the batch response was unusable: one call per description
+                results = await asyncio.gather(
+                    *(_request_simplification(description) for description in descriptions)
+                )
+        except Exception as e:
+            logging.error(f"Error dispatching simplification batch: {str(e)}")
+            results = [None] * len(batch)
+        
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+
+# Batching is opt-in: a batch uses its own prompt, so results can differ from single requests
+_simplification_batcher = _SimplificationBatcher(
+    window_seconds=int(os.getenv('ABSTRACT_BATCH_WINDOW_MS', '75')) / 1000,
+    max_batch_size=int(os.getenv('ABSTRACT_BATCH_MAX_SIZE', '1'))
+)
@@ -3,29 +3,205 @@ ArXiv-specific batch upload utilities
 Contains domain-specific logic for uploading arXiv articles in batches
 """
 import asyncio
-import json
+import gzip
+import orjson
 import logging
-from datetime import datetime
-from azure.storage.blob.aio import BlobServiceClient as AsyncBlobServiceClient
-from shared.storage_utils import get_async_blob_service_client, upload_blob_async
+import os
+import random
+import time
+from typing import Optional, Union
+from azure.core.exceptions import HttpResponseError, ServiceRequestError, ServiceResponseError
+from azure.storage.blob import ContentSettings
+from azure.storage.blob.aio import ContainerClient as AsyncContainerClient
+from shared.storage_utils import (
+    ensure_container_async,
+    get_shared_async_blob_service_client,
+    make_blob_range_url,
+    upload_blob_to_container_async
+)
 
+# Store all articles of a run in one NDJSON blob instead of one blob per article
+PACK_ARTICLES = os.getenv('ARXIV_PACK_ARTICLES', 'false').lower() == 'true'
 
-async def batch_upload_articles_async(articles_data: list, process_date: str, category: str, max_concurrency: int = 20) -> list:
+# Indent stored JSON for people inspecting blobs by hand; compact otherwise
+PRETTY_JSON = os.getenv('ARXIV_PRETTY_JSON', 'false').lower() == 'true'
+JSON_OPTION = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if PRETTY_JSON else 0)
+
+# Article JSON is stored gzip-compressed with Content-Encoding set accordingly
+ARTICLE_COMPRESSION_LEVEL = 3
+ARTICLE_CONTENT_SETTINGS = ContentSettings(content_type="application/json", content_encoding="gzip")
+
+# Leave article blobs that already exist untouched (If-None-Match: *), so retried
+# and re-run dates do not upload every article again; forced runs overwrite them
+SKIP_EXISTING_ARTICLES = os.getenv('ARXIV_SKIP_EXISTING', 'true').lower() == 'true'
+
+# Upper bound on concurrent article uploads per batch; the adaptive limiter may run fewer
+UPLOAD_CONCURRENCY = int(os.getenv('ARXIV_UPLOAD_CONCURRENCY', '8'))
+
+# Upload retry policy for throttled or transient storage failures
+UPLOAD_MAX_ATTEMPTS = 5
+UPLOAD_MAX_BACKOFF_SECONDS = 30
+_RETRYABLE_STATUS_CODES = (408, 429, 500, 502, 503, 504)
+
+# Status codes the storage service uses when it is too busy (ServerBusy / InternalError)
+_BUSY_STATUS_CODES = (500, 503)
+
+
+class AsyncRateLimiter:
+    """
+    Token bucket that allows at most max_rate acquisitions per time_period seconds
+    
+    Used as an async context manager alongside the concurrency semaphore so bursts
+    of completing uploads cannot exceed the storage account's request rate.
+    """
+    
+    def __init__(self, max_rate: float, time_period: float = 1.0):
+        self._capacity = max_rate
+        self._fill_rate = max_rate / time_period
+        self._tokens = max_rate
+        self._last_refill = time.monotonic()
+        self._lock = asyncio.Lock()
+    
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self._capacity, self._tokens + (now - self._last_refill) * self._fill_rate)
+                self._last_refill = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self._fill_rate)
+    
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Concurrency limit that halves when the service reports it is busy and grows
+    back by one after every increase_after successful uploads, up to max_limit
+    
+    Used as an async context manager in place of a fixed asyncio.Semaphore.
+    """
+    
+    def __init__(self, max_limit: int, min_limit: int = 1, increase_after: int = 10):
+        self.limit = max_limit
+        self._max_limit = max_limit
+        self._min_limit = min_limit
+        self._increase_after = increase_after
+        self._in_flight = 0
+        self._successes = 0
+        self._condition = asyncio.Condition()
+    
+    def record_success(self) -> None:
+        self._successes += 1
+        if self._successes >= self._increase_after and self.limit < self._max_limit:
+            self.limit += 1
+            self._successes = 0
+    
+    def record_busy(self) -> None:
+        new_limit = max(self._min_limit, self.limit // 2)
+        if new_limit < self.limit:
+            logging.warning(f"Storage busy, reducing upload concurrency to {new_limit}")
+        self.limit = new_limit
+        self._successes = 0
+    
+    async def __aenter__(self):
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._in_flight < self.limit)
+            self._in_flight += 1
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        async with self._condition:
+            self._in_flight -= 1
+            self._condition.notify_all()
+        return False
+
+
+# Shared across batches so concurrent orchestrations on one worker share the budget
+_upload_rate_limiter = AsyncRateLimiter(int(os.getenv('ARXIV_UPLOAD_RATE', '200')), 1.0)
+
+
+def _is_retryable_upload_error(error: Exception) -> bool:
+    """
+    Whether an upload failure is throttling or a transient service/network error
+    """
+    if isinstance(error, (ServiceRequestError, ServiceResponseError)):
+        return True
+    if isinstance(error, HttpResponseError):
+        return error.status_code in _RETRYABLE_STATUS_CODES
+    return False
+
+
+def encode_article(metadata: dict, line_terminator: bytes = b"") -> bytes:
+    """
+    Serialize article metadata as JSON and gzip it
+    
+    mtime is fixed so identical metadata always produces identical bytes. Lines
+    (line_terminator set) are always compact so NDJSON stays one document per line.
+    """
+    option = orjson.OPT_NON_STR_KEYS if line_terminator else JSON_OPTION
+    return gzip.compress(
+        orjson.dumps(metadata, option=option) + line_terminator,
+        compresslevel=ARTICLE_COMPRESSION_LEVEL,
+        mtime=0
+    )
+
+
+async def _upload_blob_with_retry(container_client: AsyncContainerClient, blob_name: str, content: Union[str, bytes], limiter: Optional[AdaptiveConcurrencyLimiter] = None, **upload_kwargs) -> str:
+    """
+    Upload a blob, retrying throttled/transient failures with exponential backoff and full jitter
+    
+    When a limiter is given, successes and busy responses are reported to it.
+    Retried attempts are logged as warnings; only the final failure is an error.
+    """
+    for attempt in range(UPLOAD_MAX_ATTEMPTS):
+        try:
+            blob_url = await upload_blob_to_container_async(container_client, blob_name, content, **upload_kwargs)
+            if limiter is not None:
+                limiter.record_success()
+            return blob_url
+        except Exception as e:
+            if limiter is not None and isinstance(e, HttpResponseError) and e.status_code in _BUSY_STATUS_CODES:
+                limiter.record_busy()
+            if attempt == UPLOAD_MAX_ATTEMPTS - 1 or not _is_retryable_upload_error(e):
+                logging.error(f"Error uploading blob {blob_name} after {attempt + 1} attempt(s): {str(e)}")
+                raise
+            delay = random.uniform(0, min(UPLOAD_MAX_BACKOFF_SECONDS, 2 ** attempt))
+            logging.warning(f"Retrying upload of {blob_name} in {delay:.2f}s after error: {str(e)}")
+            await asyncio.sleep(delay)
+
+
+async def batch_upload_articles_async(articles_data: list, process_date: str, category: str, max_concurrency: int = UPLOAD_CONCURRENCY, skip_existing: bool = SKIP_EXISTING_ARTICLES) -> list:
     """
     Upload multiple articles concurrently to blob storage
+    
+    At most max_concurrency uploads run at once; fewer while storage reports it is busy.
+    With skip_existing, articles whose blob already exists are not uploaded again.
     """
     container_name = "arxiv-data"
     
-    async def upload_single_article(article_data: tuple, blob_service_client: AsyncBlobServiceClient) -> dict:
+    async def upload_single_article(article_data: tuple, container_client: AsyncContainerClient, limiter: AdaptiveConcurrencyLimiter) -> dict:
         """Upload a single article and return result"""
         identifier = "unknown"
         try:
             metadata, identifier = article_data
             blob_name = f"{category}/ProcessDate={process_date}/articles/{identifier}.json"
-            json_content = json.dumps(metadata, indent=2, ensure_ascii=False)
+            json_content = encode_article(metadata)
             
-            blob_url = await upload_blob_async(blob_service_client, container_name, blob_name, json_content)
-            logging.debug(f"Article {identifier} uploaded successfully")
+            blob_url = await _upload_blob_with_retry(
+                container_client, blob_name, json_content,
+                limiter=limiter,
+                skip_existing=skip_existing,
+                content_settings=ARTICLE_CONTENT_SETTINGS
+            )
+            logging.debug("Article %s uploaded successfully", identifier)
             
             return {
                 "identifier": identifier,
@@ -42,46 +218,41 @@ async def batch_upload_articles_async(articles_data: list, process_date: str, ca
             }
     
     try:
-        # Get async blob service client
-        blob_service_client = await get_async_blob_service_client()
+        # Get the shared async blob service client and create the container before fanning out
+        blob_service_client = await get_shared_async_blob_service_client()
+        await ensure_container_async(blob_service_client, container_name)
+        container_client = blob_service_client.get_container_client(container_name)
         
-        # Create semaphore to limit concurrent uploads
-        semaphore = asyncio.Semaphore(max_concurrency)
+        # Limit concurrent uploads, backing off while storage is busy
+        limiter = AdaptiveConcurrencyLimiter(max_concurrency)
         
-        async def upload_with_semaphore(article_data):
-            async with semaphore:
-                return await upload_single_article(article_data, blob_service_client)
+        # A fixed pool of workers drains the articles, so only max_concurrency
+        # coroutines exist at once however large the feed is
+        results = [None] * len(articles_data)
+        pending = enumerate(articles_data)
         
-        # Create tasks for all uploads
-        tasks = [upload_with_semaphore(article_data) for article_data in articles_data]
+        async def upload_worker():
+            for index, article_data in pending:
+                try:
+                    async with limiter, _upload_rate_limiter:
+                        results[index] = await upload_single_article(article_data, container_client, limiter)
+                except Exception as e:
+                    logging.error(f"Upload task failed with exception: {e}")
+                    results[index] = {
+                        "identifier": "unknown",
+                        "url": "",
+                        "status": "error",
+                        "error": str(e)
+                    }
         
         # Execute all uploads concurrently
-        start_time = datetime.now()
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        end_time = datetime.now()
-        
-        # Close the blob service client
-        await blob_service_client.close()
-        
-        # Process results (handle any exceptions)
-        processed_results = []
-        for result in results:
-            if isinstance(result, Exception):
-                logging.error(f"Upload task failed with exception: {result}")
-                processed_results.append({
-                    "identifier": "unknown",
-                    "url": "",
-                    "status": "error",
-                    "error": str(result)
-                })
-            else:
-                processed_results.append(result)
+        start_time = time.perf_counter()
+        await asyncio.gather(*[upload_worker() for _ in range(min(max_concurrency, len(articles_data)))])
+        upload_duration = time.perf_counter() - start_time
         
         # Filter successful uploads
-        successful_uploads = [result for result in processed_results if result["status"] == "success"]
-        failed_uploads = [result for result in processed_results if result["status"] == "error"]
-        
-        upload_duration = (end_time - start_time).total_seconds()
+        successful_uploads = [result for result in results if result["status"] == "success"]
+        failed_uploads = [result for result in results if result["status"] == "error"]
         
         if failed_uploads:
             logging.warning(f"{len(failed_uploads)} articles failed to upload")
@@ -95,23 +266,56 @@ async def batch_upload_articles_async(articles_data: list, process_date: str, ca
         return []
 
 
-def run_batch_upload_sync(articles_data: list, process_date: str, category: str, max_concurrency: int = 20) -> list:
+async def upload_packed_articles_async(articles_data: list, process_date: str, category: str) -> list:
     """
-    Synchronous wrapper for async batch upload (for use in Azure Functions)
+    Upload all articles as a single NDJSON blob plus an identifier index
+    
+    Each returned url addresses its article's line via make_blob_range_url, so it
+    can be passed to the abstract endpoint like a per-article blob URL.
     """
+    container_name = "arxiv-data"
+    prefix = f"{category}/ProcessDate={process_date}"
+    
     try:
-        # Create new event loop for this thread if none exists
-        try:
-            loop = asyncio.get_event_loop()
-            if loop.is_closed():
-                raise RuntimeError("Event loop is closed")
-        except RuntimeError:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
+        # Pack articles one JSON document per line, recording each line's byte range.
+        # Every line is its own gzip member, so a range read decompresses on its own
+        # and the whole blob still decompresses to plain NDJSON.
+        packed = bytearray()
+        index = {}
+        for metadata, identifier in articles_data:
+            member = encode_article(metadata, line_terminator=b"\n")
+            index[identifier] = [len(packed), len(member)]
+            packed += member
         
-        return loop.run_until_complete(
-            batch_upload_articles_async(articles_data, process_date, category, max_concurrency)
+        index_content = orjson.dumps({
+            "articles_blob": "articles.ndjson",
+            "articles": index
+        })
+        
+        blob_service_client = await get_shared_async_blob_service_client()
+        await ensure_container_async(blob_service_client, container_name)
+        container_client = blob_service_client.get_container_client(container_name)
+        
+        start_time = time.perf_counter()
+        articles_url, _ = await asyncio.gather(
+            _upload_blob_with_retry(
+                container_client, f"{prefix}/articles.ndjson", bytes(packed),
+                content_settings=ContentSettings(content_type="application/x-ndjson", content_encoding="gzip")
+            ),
+            _upload_blob_with_retry(container_client, f"{prefix}/articles_index.json", index_content)
         )
+        upload_duration = time.perf_counter() - start_time
+        logging.info(f"Packed upload completed in {upload_duration:.2f}s: {len(index)} articles, {len(packed)} bytes")
+        
+        return [
+            {
+                "identifier": identifier,
+                "url": make_blob_range_url(articles_url, offset, length),
+                "status": "success"
+            }
+            for identifier, (offset, length) in index.items()
+        ]
+        
     except Exception as e:
-        logging.error(f"Error in sync batch upload wrapper: {str(e)}")
+        logging.error(f"Error in packed article upload: {str(e)}")
         return []
@@ -9,17 +9,160 @@ This blueprint contains all arXiv-related functionality:
 """
 import azure.functions as func
 import azure.durable_functions as df
+import aiohttp
+import asyncio
+import atexit
 import logging
-import json
-import feedparser
-import requests
+import multiprocessing
+import orjson
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime, timezone
-from shared.storage_utils import get_blob_service_client, upload_blob_with_container_creation
-from .batch_upload import run_batch_upload_sync
+from typing import Optional
+from azure.core.exceptions import ResourceNotFoundError
+from azure.storage.blob import ContentSettings
+from azure.storage.blob.aio import BlobServiceClient as AsyncBlobServiceClient
+from shared.storage_utils import (
+    ensure_container_async,
+    get_blob_service_client,
+    get_shared_async_blob_client_from_url,
+    get_shared_async_blob_service_client,
+    upload_blob_with_container_creation
+)
+from .batch_upload import (
+    JSON_OPTION,
+    PACK_ARTICLES,
+    SKIP_EXISTING_ARTICLES,
+    batch_upload_articles_async,
+    upload_packed_articles_async
+)
+from .rss_parser import parse_rss_bytes
 
 # Create the blueprint
 arxiv_bp = func.Blueprint()
 
+# Shared HTTP session for arXiv requests, created lazily on the worker's event loop
+_http_session: Optional[aiohttp.ClientSession] = None
+
+
+def _get_http_session() -> aiohttp.ClientSession:
+    """
+    Get the shared aiohttp session so warm invocations reuse their connections
+    """
+    global _http_session
+    if _http_session is None or _http_session.closed:
+        _http_session = aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(total=30, connect=5),
+            connector=aiohttp.TCPConnector(limit=10, ttl_dns_cache=300),
+            headers={"Accept-Encoding": "gzip, deflate"}
+        )
+    return _http_session
+
+
+def _close_http_session():
+    """
+    Best-effort release of the shared arXiv session's connections on worker shutdown
+    """
+    if _http_session is None or _http_session.closed:
+        return
+    try:
+        asyncio.run(_http_session.close())
+    except Exception as e:
+        logging.debug(f"Error closing arXiv HTTP session: {str(e)}")
+
+
+atexit.register(_close_http_session)
+
+
+# Retry policy for transient arXiv failures before any of the body is read
+RSS_FETCH_MAX_ATTEMPTS = 3
+RSS_FETCH_BACKOFF_SECONDS = 0.3
+_RETRYABLE_FETCH_STATUSES = (502, 503, 504)
+
+
+async def _open_rss_response(rss_url: str, headers: Optional[dict] = None) -> aiohttp.ClientResponse:
+    """
+    GET rss_url, retrying connection errors and 502/503/504 responses with exponential backoff
+    
+    The caller owns the returned response and must release it (e.g. with async with).
+    """
+    for attempt in range(RSS_FETCH_MAX_ATTEMPTS):
+        is_last_attempt = attempt == RSS_FETCH_MAX_ATTEMPTS - 1
+        try:
+            response = await _get_http_session().get(rss_url, headers=headers)
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+            if is_last_attempt:
+                raise
+            logging.warning(f"Retrying arXiv request after error: {str(e)}")
+        else:
+            if response.status not in _RETRYABLE_FETCH_STATUSES or is_last_attempt:
+                response.raise_for_status()
+                return response
+            response.release()
+            logging.warning(f"Retrying arXiv request after HTTP {response.status}")
+        await asyncio.sleep(RSS_FETCH_BACKOFF_SECONDS * 2 ** attempt)
+
+
+# Read size when piping the arXiv response into the raw RSS blob
+RSS_STREAM_CHUNK_SIZE = 64 * 1024
+
+# Blocks of the raw RSS blob uploaded in parallel
+RSS_UPLOAD_MAX_CONCURRENCY = 4
+
+# Send If-None-Match/If-Modified-Since from the last completed run and skip unchanged feeds
+CONDITIONAL_RSS_FETCH = os.getenv('ARXIV_CONDITIONAL_FETCH', 'true').lower() == 'true'
+RSS_VALIDATORS_BLOB = "rss_validators.json"
+
+# Worker processes for CPU-bound RSS parsing (0 parses on a thread instead)
+RSS_PARSE_WORKERS = int(os.getenv('ARXIV_PARSE_WORKERS', '2'))
+_parse_pool: Optional[ProcessPoolExecutor] = None
+
+
+async def _parse_rss_off_loop(rss_bytes: bytes) -> list:
+    """
+    Parse RSS in a worker process so the event loop (and the GIL) stay free
+    
+    The pool is created on first use with the forkserver start method, which
+    is safe to use from the multi-threaded Functions worker. If the pool cannot
+    start or breaks, it is replaced on the next call and this parse falls back to
+    a thread; exceptions raised by the parser itself propagate.
+    """
+    global _parse_pool
+    
+    if RSS_PARSE_WORKERS > 0:
+        pool = _parse_pool
+        try:
+            if pool is None:
+                pool = _parse_pool = ProcessPoolExecutor(
+                    max_workers=RSS_PARSE_WORKERS,
+                    mp_context=multiprocessing.get_context("forkserver")
+                )
+            future = pool.submit(parse_rss_bytes, rss_bytes)
+        except (BrokenProcessPool, OSError, RuntimeError) as e:
+            _discard_parse_pool(pool, e)
+        else:
+            try:
+                return await asyncio.wrap_future(future)
+            except BrokenProcessPool as e:
+                _discard_parse_pool(pool, e)
+    
+    return await asyncio.to_thread(parse_rss_bytes, rss_bytes)
+
+
+def _discard_parse_pool(pool: Optional[ProcessPoolExecutor], error: Exception) -> None:
+    """
+    Drop a parse pool that could not start or broke, without cancelling other callers' parses
+    """
+    global _parse_pool
+    logging.warning(f"RSS parse process pool unavailable, parsing on a thread: {str(error)}")
+    if pool is None:
+        return
+    if _parse_pool is pool:
+        _parse_pool = None
+    # Parses already running in a healthy pool finish; a broken pool has failed them already
+    pool.shutdown(wait=False)
+
 
 # HTTP starter function to initiate the durable function
 @arxiv_bp.route(route="http_trigger_arxiv_rss", methods=["POST"])
@@ -28,14 +171,16 @@ async def http_trigger_arxiv_rss(req: func.HttpRequest, client) -> func.HttpResp
     logging.info('HTTP trigger function received a request.')
 
     try:
-        req_body = req.get_json()
+        req_body = orjson.loads(req.get_body())
         category = req_body.get('category', 'cs')
         process_date = req_body.get('ProcessDate')
+        # force re-fetches the feed even when it is unchanged since the last completed run
+        force = req_body.get('force', False) is True
         
         # ProcessDate is required
         if not process_date:
             return func.HttpResponse(
-                json.dumps({
+                orjson.dumps({
                     "status": "error",
                     "message": "ProcessDate is required in the request body"
                 }),
@@ -48,7 +193,8 @@ async def http_trigger_arxiv_rss(req: func.HttpRequest, client) -> func.HttpResp
         # Start the orchestrator
         instance_id = await client.start_new("arxiv_orchestrator", client_input={
             "category": category,
-            "process_date": process_date
+            "process_date": process_date,
+            "force": force
         })
         
         logging.info(f"Started orchestration with ID = '{instance_id}'.")
@@ -59,7 +205,7 @@ async def http_trigger_arxiv_rss(req: func.HttpRequest, client) -> func.HttpResp
     except Exception as e:
         logging.error(f"Error starting orchestration: {str(e)}")
         return func.HttpResponse(
-            json.dumps({
+            orjson.dumps({
                 "status": "error",
                 "message": f"Error starting orchestration: {str(e)}"
             }),
@@ -78,7 +224,7 @@ async def get_arxiv_status(req: func.HttpRequest, client) -> func.HttpResponse:
         status = await client.get_status(instance_id)
         
         return func.HttpResponse(
-            json.dumps({
+            orjson.dumps({
                 "instanceId": status.instance_id,
                 "runtimeStatus": status.runtime_status.name if status.runtime_status else None,
                 "input": status.input_,
@@ -92,7 +238,7 @@ async def get_arxiv_status(req: func.HttpRequest, client) -> func.HttpResponse:
     except Exception as e:
         logging.error(f"Error getting status for instance {instance_id}: {str(e)}")
         return func.HttpResponse(
-            json.dumps({
+            orjson.dumps({
                 "status": "error",
                 "message": f"Error getting status: {str(e)}"
             }),
@@ -110,42 +256,58 @@ def arxiv_orchestrator(context: df.DurableOrchestrationContext):
     input_data = context.get_input()
     category = input_data.get("category") # type: ignore
     process_date = input_data.get("process_date") # type: ignore
+    force = bool(input_data.get("force")) # type: ignore
     
     try:
-        # Step 1: Fetch arXiv RSS content
-        rss_content = yield context.call_activity("fetch_arxiv_rss_activity", category)
+        # Step 1: Fetch arXiv RSS content and store it raw; only the blob URL is returned
+        # so the RSS itself never enters orchestration history
+        fetch_result = yield context.call_activity("fetch_arxiv_rss_activity", {
+            "process_date": process_date,
+            "category": category,
+            "force": force
+        })
         
-        if not rss_content:
+        if not fetch_result:
             return {
                 "status": "error",
                 "message": "Failed to fetch arXiv RSS content"
             }
         
-        # Step 2: Store raw RSS content
-        raw_storage_result = yield context.call_activity("store_raw_rss_activity", {
-            "content": rss_content,
-            "process_date": process_date,
-            "category": category
-        })
+        # arXiv answered 304: the feed is unchanged since the last completed run
+        if fetch_result.get("not_modified"):
+            return {
+                "status": "not_modified",
+                "message": f"arXiv RSS feed for {category} is unchanged since the last processed run",
+                "category": category,
+                "process_date": process_date
+            }
+        
+        raw_storage_result = fetch_result["raw_blob_url"]
         
-        # Step 3: Parse and store articles
-        article_urls = yield context.call_activity("parse_and_store_articles_activity", {
-            "rss_content": rss_content,
+        # Step 2: Parse the stored RSS and store articles
+        parse_result = yield context.call_activity("parse_and_store_articles_activity", {
+            "raw_blob_url": raw_storage_result,
             "process_date": process_date,
-            "category": category
+            "category": category,
+            "force": force
         })
+        articles_stored = parse_result["article_count"]
+        articles_failed = parse_result["failed_count"]
         
-        # Step 4: Store metadata
+        # Step 3: Store metadata
         metadata_result = yield context.call_activity("store_metadata_activity", {
-            "article_count": len(article_urls) if article_urls else 0,
+            "article_count": articles_stored,
+            "failed_count": articles_failed,
             "process_date": process_date,
-            "category": category
+            "category": category,
+            "rss_validators": fetch_result.get("validators")
         })
         
         return {
             "status": "success",
             "message": f"arXiv RSS content processed successfully for {process_date}",
-            "articles_stored": len(article_urls) if article_urls else 0,
+            "articles_stored": articles_stored,
+            "articles_failed": articles_failed,
             "category": category,
             "process_date": process_date,
             "raw_storage_url": raw_storage_result,
@@ -160,54 +322,47 @@ def arxiv_orchestrator(context: df.DurableOrchestrationContext):
         }
 
 
-# Activity function to fetch arXiv RSS content
-@arxiv_bp.activity_trigger(input_name="category")
-def fetch_arxiv_rss_activity(category: str) -> str:
-    """
-    Activity function to fetch raw RSS content from arXiv API
-    """
-    try:
-        result = fetch_arxiv_rss(category)
-        return result
-    except Exception as e:
-        logging.error(f"Error in fetch_arxiv_rss_activity: {str(e)}")
-        return ""
-
-
-# Activity function to store raw RSS content
+# Activity function to fetch arXiv RSS content and store it raw
 @arxiv_bp.activity_trigger(input_name="input_data")
-def store_raw_rss_activity(input_data: dict) -> str:
+async def fetch_arxiv_rss_activity(input_data: dict) -> dict:
     """
-    Activity function to store raw RSS content in Azure Blob Storage
+    Activity function to fetch raw RSS content from arXiv API and store it in
+    Azure Blob Storage, returning the blob URL and the response's cache validators
+    (or {"not_modified": True} when arXiv answers 304)
     """
     try:
-        result = store_raw_rss_content(
-            input_data["content"], 
-            input_data["process_date"], 
-            input_data["category"]
+        result = await fetch_and_store_raw_rss(
+            input_data["category"],
+            input_data["process_date"],
+            force=input_data.get("force", False)
         )
         return result
     except Exception as e:
-        logging.error(f"Error in store_raw_rss_activity: {str(e)}")
-        return ""
+        logging.error(f"Error in fetch_arxiv_rss_activity: {str(e)}")
+        return {}
 
 
 # Activity function to parse and store articles
 @arxiv_bp.activity_trigger(input_name="input_data")
-def parse_and_store_articles_activity(input_data: dict) -> list:
+async def parse_and_store_articles_activity(input_data: dict) -> dict:
     """
-    Activity function to parse RSS content and store individual articles
+    Activity function to parse the stored raw RSS content and store individual articles
+    
+    Returns only the numbers of stored and failed articles; the orchestrator needs
+    nothing else, and every activity output is persisted in orchestration history.
     """
     try:
-        result = parse_and_store_articles(
-            input_data["rss_content"],
+        rss_content = await download_raw_rss_content(input_data["raw_blob_url"])
+        successful_uploads, failed_count = await parse_and_store_articles(
+            rss_content,
             input_data["process_date"],
-            input_data["category"]
+            input_data["category"],
+            force=input_data.get("force", False)
         )
-        return result
+        return {"article_count": len(successful_uploads), "failed_count": failed_count}
     except Exception as e:
         logging.error(f"Error in parse_and_store_articles_activity: {str(e)}")
-        return []
+        return {"article_count": 0, "failed_count": 0}
 
 
 # Activity function to store metadata
@@ -222,149 +377,170 @@ def store_metadata_activity(input_data: dict) -> str:
             input_data["process_date"],
             input_data["category"]
         )
+        
+        # Remember the feed version only once a run has stored all of its articles,
+        # so a failed or partly failed run is not skipped as unchanged when retried
+        validators = input_data.get("rss_validators")
+        if result and validators and input_data["article_count"] and not input_data.get("failed_count"):
+            store_rss_validators(input_data["category"], validators)
+        
         return result
     except Exception as e:
         logging.error(f"Error in store_metadata_activity: {str(e)}")
         return ""
 
 
-def fetch_arxiv_rss(category: str) -> str:
+async def fetch_and_store_raw_rss(category: str, process_date: str, force: bool = False) -> dict:
     """
-    Fetch raw RSS content from arXiv API
+    Stream raw RSS content from arXiv API straight into Azure Blob Storage
+    
+    The response body is piped chunk by chunk into the upload, so the feed is
+    never held in memory as a whole or decoded into a str. Unless force is set,
+    the request is conditional on the validators of the last completed run, and
+    {"not_modified": True} is returned when arXiv answers 304.
     """
     try:
         # arXiv RSS URL format
         rss_url = f"https://rss.arxiv.org/rss/{category}"
         
+        # Container name
+        container_name = "arxiv-data"
+        
+        # Create blob name with category and ProcessDate folder structure
+        blob_name = f"{category}/ProcessDate={process_date}/rss_raw.xml"
+        
+        # Reuse the shared async blob service client; the container must exist
+        # up front because a streamed body cannot be replayed for a retry
+        blob_service_client = await get_shared_async_blob_service_client()
+        await ensure_container_async(blob_service_client, container_name)
+        blob_client = blob_service_client.get_blob_client(container=container_name, blob=blob_name)
+        
         logging.info(f"Fetching RSS from: {rss_url}")
         
-        # Fetch the raw RSS content
-        response = requests.get(rss_url, timeout=30)
-        response.raise_for_status()
+        headers = {}
+        if CONDITIONAL_RSS_FETCH and not force:
+            validators = await read_rss_validators(blob_service_client, category)
+            if validators.get("etag"):
+                headers["If-None-Match"] = validators["etag"]
+            if validators.get("last_modified"):
+                headers["If-Modified-Since"] = validators["last_modified"]
+        
+        total_bytes = 0
+        
+        # aiohttp negotiates gzip and hands us the decompressed body
+        async with await _open_rss_response(rss_url, headers) as response:
+            if response.status == 304:
+                logging.info(f"arXiv RSS feed for {category} not modified since the last processed run")
+                return {"not_modified": True}
+            
+            response_validators = {
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified")
+            }
+            
+            async def body_chunks():
+                nonlocal total_bytes
+                async for chunk in response.content.iter_chunked(RSS_STREAM_CHUNK_SIZE):
+                    total_bytes += len(chunk)
+                    yield chunk
+            
+            # A stream of unknown length is always uploaded as staged blocks,
+            # so let large feeds put several blocks at once
+            await blob_client.upload_blob(
+                body_chunks(),
+                overwrite=True,
+                max_concurrency=RSS_UPLOAD_MAX_CONCURRENCY,
+                content_settings=ContentSettings(content_type="application/rss+xml")
+            )
         
-        raw_rss_content = response.text
+        if not total_bytes:
+            logging.error(f"arXiv returned an empty RSS feed for category: {category}")
+            return {}
         
-        logging.info(f"Successfully fetched raw RSS content from arXiv, content length: {len(raw_rss_content)} characters")
-        return raw_rss_content
+        logging.info(f"Raw RSS content streamed to blob {blob_name}, content length: {total_bytes} bytes")
+        return {
+            "raw_blob_url": blob_client.url,
+            "validators": response_validators
+        }
         
     except Exception as e:
-        logging.error(f"Error fetching arXiv RSS: {str(e)}")
-        return ""
+        logging.error(f"Error fetching and storing arXiv RSS: {str(e)}")
+        return {}
 
 
-def store_raw_rss_content(content: str, process_date: str, category: str) -> str:
+async def read_rss_validators(blob_service_client: AsyncBlobServiceClient, category: str) -> dict:
     """
-    Store the raw RSS content in Azure Blob Storage
+    Read the ETag/Last-Modified of the last completed run for a category, or {} if none
     """
     try:
-        # Create blob service client using RBAC
-        blob_service_client = get_blob_service_client()
-        
-        # Container name
-        container_name = "arxiv-data"
-        
-        # Create blob name with category and ProcessDate folder structure
-        blob_name = f"{category}/ProcessDate={process_date}/rss_raw.xml"
-        
-        # Upload raw content to blob storage with container creation
-        blob_url = upload_blob_with_container_creation(
-            blob_service_client, 
-            container_name, 
-            blob_name, 
-            content
+        blob_client = blob_service_client.get_blob_client(container="arxiv-data", blob=f"{category}/{RSS_VALIDATORS_BLOB}")
+        downloader = await blob_client.download_blob()
+        return orjson.loads(await downloader.readall())
+    except ResourceNotFoundError:
+        return {}
+    except Exception as e:
+        logging.warning(f"Could not read RSS validators for {category}: {str(e)}")
+        return {}
+
+
+def store_rss_validators(category: str, validators: dict) -> None:
+    """
+    Persist the ETag/Last-Modified of a completed run for conditional fetches
+    """
+    try:
+        upload_blob_with_container_creation(
+            get_blob_service_client(),
+            "arxiv-data",
+            f"{category}/{RSS_VALIDATORS_BLOB}",
+            orjson.dumps(validators)
         )
-        
-        logging.info(f"Raw RSS content stored successfully in blob: {blob_name}")
-        
-        return blob_url
-        
     except Exception as e:
-        logging.error(f"Error storing raw RSS content in blob: {str(e)}")
-        raise e
+        # Only costs a full download on the next run
+        logging.warning(f"Could not store RSS validators for {category}: {str(e)}")
+
 
+async def download_raw_rss_content(raw_blob_url: str) -> bytes:
+    """
+    Download raw RSS content previously stored by fetch_and_store_raw_rss
+    """
+    blob_client = await get_shared_async_blob_client_from_url(raw_blob_url)
+    downloader = await blob_client.download_blob(max_concurrency=4)
+    return await downloader.readall()
 
-def parse_and_store_articles(rss_content: str, process_date: str, category: str) -> list:
+
+async def parse_and_store_articles(rss_content: bytes, process_date: str, category: str, force: bool = False) -> tuple:
     """
     Parse RSS content and store individual articles as separate files using async batch upload
+    
+    Existing article blobs are kept (see ARXIV_SKIP_EXISTING) unless force is set,
+    in which case every article is rewritten.
+    
+    Returns:
+        tuple: (successful uploads, number of parsed articles that were not stored)
     """
     try:
-        # Parse the RSS feed
-        feed = feedparser.parse(rss_content)
-        
-        if feed.bozo:
-            logging.warning(f"RSS feed parsing warning: {feed.bozo_exception}")
-        
-        articles_data = []
-        
-        # Process each article and prepare data for batch upload
-        for entry in feed.entries:
-            # Extract identifier from the guid field (arXiv RSS standard)
-            identifier = None
-            
-            # arXiv RSS uses guid with format: oai:arXiv.org:2203.01250v3
-            if hasattr(entry, 'guid') and entry.guid:
-                guid = str(entry.guid)
-                if 'oai:arXiv.org:' in guid:
-                    identifier = guid.split('oai:arXiv.org:')[-1]
-            
-            # Fallback to link if guid not available
-            if not identifier and hasattr(entry, 'link') and entry.link:
-                link = str(entry.link)
-                if 'arxiv.org/abs/' in link:
-                    identifier = link.split('arxiv.org/abs/')[-1]
-            
-            # Final fallback: abandon entry if no identifier found
-            if not identifier:
-                continue
-            
-            # Extract DOI from arxiv:DOI element
-            doi = None
-            if hasattr(entry, 'arxiv_doi') and entry.arxiv_doi:
-                doi = entry.arxiv_doi
-            elif hasattr(entry, 'doi') and entry.doi:
-                doi = entry.doi
+        # Stream-parse the RSS feed off the event loop and prepare data for batch upload
+        articles_data = await _parse_rss_off_loop(rss_content)
+        
+        if PACK_ARTICLES:
+            logging.info(f"Parsed {len(articles_data)} articles, starting packed upload...")
+            successful_uploads = await upload_packed_articles_async(articles_data, process_date, category)
+        else:
+            logging.info(f"Parsed {len(articles_data)} articles, starting concurrent batch upload...")
             
-            # Extract creator from dc:creator (Dublin Core namespace)
-            creator = None
-            if hasattr(entry, 'author') and entry.author:
-                creator = entry.author
-            elif hasattr(entry, 'authors') and entry.authors:
-                # authors is a list of author objects
-                author_names = []
-                for author in entry.authors:
-                    if hasattr(author, 'name') and author.name:
-                        author_names.append(author.name)
-                if author_names:
-                    creator = ', '.join(author_names)
-            
-            # Extract description (contains arXiv ID, announce type, and abstract)
-            description = entry.get('description', '') or entry.get('summary', '')
-            
-            # Create simplified article metadata with only requested fields
-            article_metadata = {
-                "identifier": identifier,
-                "title": entry.get('title', ''),
-                "link": entry.get('link', ''),
-                "description": description,
-                "creator": creator,
-                "doi": doi
-            }
-            
-            # Add to batch data (tuple of metadata and identifier)
-            articles_data.append((article_metadata, identifier))
-        
-        logging.info(f"Parsed {len(articles_data)} articles, starting concurrent batch upload...")
-        
-        # Use async batch upload with configurable concurrency
-        # Adjust max_concurrency based on your needs: higher = faster but more resource intensive
-        successful_uploads = run_batch_upload_sync(articles_data, process_date, category, max_concurrency=20)
+            # Use async batch upload with configurable concurrency
+            # Concurrency defaults to ARXIV_UPLOAD_CONCURRENCY: higher = faster but more resource intensive
+            successful_uploads = await batch_upload_articles_async(
+                articles_data, process_date, category,
+                skip_existing=SKIP_EXISTING_ARTICLES and not force
+            )
         
         logging.info(f"Successfully processed and stored {len(successful_uploads)} articles using async batch upload")
-        return successful_uploads
+        return successful_uploads, len(articles_data) - len(successful_uploads)
         
     except Exception as e:
         logging.error(f"Error parsing and storing articles: {str(e)}")
-        return []
+        return [], 0
 
 
 def store_metadata(article_count: int, process_date: str, category: str) -> str:
@@ -391,7 +567,7 @@ def store_metadata(article_count: int, process_date: str, category: str) -> str:
         blob_name = f"{category}/ProcessDate={process_date}/meta.json"
         
         # Convert metadata to JSON string
-        json_content = json.dumps(metadata, indent=2, ensure_ascii=False)
+        json_content = orjson.dumps(metadata, option=JSON_OPTION)
         
         # Upload to blob storage with container creation
         blob_url = upload_blob_with_container_creation(
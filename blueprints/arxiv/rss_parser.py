@@ -0,0 +1,99 @@
+"""
+ArXiv-specific RSS parsing utilities
+Streams arXiv RSS items into article metadata without building a full feed tree
+
+Kept free of Azure imports so it is cheap to load in parse worker processes.
+"""
+import logging
+import re
+from io import BytesIO
+from typing import Iterator
+from lxml import etree
+
+# XML namespaces used by arXiv RSS items
+_DC_CREATOR = "{http://purl.org/dc/elements/1.1/}creator"
+_ARXIV_DOI_TAGS = ("{http://arxiv.org/schemas/atom}DOI", "{http://arxiv.org/schemas/atom}doi")
+
+# arXiv identifier from a guid (oai:arXiv.org:2203.01250v3) or abs link
+_ID_RE = re.compile(r'(?:oai:arXiv\.org:|arxiv\.org/abs/)([^\s"<]+)')
+
+# Version suffix of an arXiv identifier (2203.01250v3 -> 3)
+_VERSION_RE = re.compile(r'v(\d+)$')
+
+
+def _iter_arxiv_items(rss_bytes: bytes) -> Iterator[tuple]:
+    """
+    Stream-parse arXiv RSS and yield (article_metadata, identifier) tuples
+    
+    Each <item> is cleared once read so memory stays flat for large feeds.
+    """
+    context = etree.iterparse(
+        BytesIO(rss_bytes),
+        events=("end",),
+        tag="item",
+        recover=True,
+        resolve_entities=False
+    )
+    
+    try:
+        for _, item in context:
+            # Index the item's child text by tag in one pass instead of one findtext scan per field
+            fields = {child.tag: child.text for child in item}
+            get = fields.get
+            
+            # Extract identifier from the guid field (arXiv RSS standard),
+            # falling back to the link if guid is missing or not an arXiv id
+            guid = get("guid")
+            link = get("link") or ''
+            match = (guid and _ID_RE.search(guid)) or _ID_RE.search(link)
+            identifier = match.group(1) if match else None
+            
+            # Final fallback: abandon entry if no identifier found
+            if identifier:
+                # Create simplified article metadata with only requested fields
+                article_metadata = {
+                    "identifier": identifier,
+                    "title": get("title") or '',
+                    "link": link,
+                    # Description contains arXiv ID, announce type, and abstract
+                    "description": get("description") or '',
+                    "creator": get(_DC_CREATOR) or None,
+                    # DOI from the arxiv:DOI element
+                    "doi": get(_ARXIV_DOI_TAGS[0]) or get(_ARXIV_DOI_TAGS[1]) or None
+                }
+                
+                yield article_metadata, identifier
+            
+            # Release the parsed item and any already-processed siblings
+            item.clear()
+            while item.getprevious() is not None:
+                del item.getparent()[0]
+    except etree.XMLSyntaxError as e:
+        logging.warning(f"RSS feed parsing warning: {str(e)}")
+
+
+def _split_version(identifier: str) -> tuple:
+    """
+    Split an arXiv identifier into its base id and version number (0 if unversioned)
+    """
+    match = _VERSION_RE.search(identifier)
+    if match:
+        return identifier[:match.start()], int(match.group(1))
+    return identifier, 0
+
+
+def parse_rss_bytes(rss_bytes: bytes) -> list:
+    """
+    Parse arXiv RSS into a list of (article_metadata, identifier) tuples
+    
+    A paper announced more than once (e.g. v1 and v2) is kept only at its highest
+    version, in the position of its first appearance. Module-level and returning
+    plain data so it can run in a process pool.
+    """
+    latest = {}
+    for article in _iter_arxiv_items(rss_bytes):
+        base_id, version = _split_version(article[1])
+        seen = latest.get(base_id)
+        if seen is None or version >= seen[0]:
+            latest[base_id] = (version, article)
+    return [article for _, article in latest.values()]
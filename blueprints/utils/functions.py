@@ -7,15 +7,133 @@ This blueprint provides common utility functions:
 - Storage administration
 """
 import azure.functions as func
+import asyncio
 import logging
-import json
-from datetime import datetime, timezone
+import orjson
 import os
-from shared.storage_utils import get_blob_service_client
+from functools import lru_cache
+from typing import Optional
+from azure.storage.blob import BlobProperties
+from azure.storage.blob.aio import BlobServiceClient, ContainerClient
+from shared.http_utils import dumps_json, etag_matches, make_etag, utc_now_iso
+from shared.storage_utils import get_shared_async_blob_service_client
 
 # Create utilities blueprint for common functions
 utils_bp = func.Blueprint()
 
+# Containers fetched per List Containers round-trip
+CONTAINER_PAGE_SIZE = 500
+
+# Non-sensitive configuration info; app settings are fixed for the worker's lifetime
+CONFIG_INFO = {
+    "function_app_name": os.getenv("WEBSITE_SITE_NAME", "unknown"),
+    "resource_group": os.getenv("WEBSITE_RESOURCE_GROUP", "unknown"),
+    "subscription_id": os.getenv("WEBSITE_OWNER_NAME", "unknown").split("+")[0] if os.getenv("WEBSITE_OWNER_NAME") else "unknown",
+    "region": os.getenv("REGION_NAME", "unknown"),
+    "runtime_version": os.getenv("FUNCTIONS_EXTENSION_VERSION", "unknown"),
+    "python_version": os.getenv("FUNCTIONS_WORKER_RUNTIME_VERSION", "unknown")
+}
+
+# Serialized once with the closing brace dropped so the timestamp can be appended
+_CONFIG_INFO_PREFIX = orjson.dumps(CONFIG_INFO)[:-1]
+_CONFIG_INFO_ETAG = make_etag(_CONFIG_INFO_PREFIX)
+
+# Upper bound on the blob storage probe so a slow listing cannot stall the health check
+HEALTH_CHECK_TIMEOUT_SECONDS = 2.0
+
+# Blob listing page size and the most blobs one request may return
+BLOB_PAGE_SIZE = 1000
+MAX_BLOB_RESULTS = 5000
+
+# Listings running at once across all requests on this worker, bounding open storage connections
+STORAGE_LISTING_CONCURRENCY = int(os.getenv('UTILS_STORAGE_CONCURRENCY', '16'))
+_storage_listing_semaphore = asyncio.Semaphore(STORAGE_LISTING_CONCURRENCY)
+
+# Prefix shards listed at once by list_container_blobs
+LISTING_SHARD_CONCURRENCY = 8
+
+# Blob fields list_container_blobs can return via ?fields=; name is always included
+BLOB_FIELDS = ("name", "size", "last_modified", "content_type", "url")
+DEFAULT_BLOB_FIELDS = ("name", "size")
+
+
+# Container clients kept for reuse across list_container_blobs requests
+CONTAINER_CLIENT_CACHE_SIZE = 64
+
+
+@lru_cache(maxsize=CONTAINER_CLIENT_CACHE_SIZE)
+def _get_container_client(blob_service_client: BlobServiceClient, container_name: str) -> ContainerClient:
+    """
+    Get a ContainerClient for container_name, reusing one built by an earlier request
+    
+    Container clients share the service client's transport, so keeping them is cheap.
+    """
+    return blob_service_client.get_container_client(container_name)
+
+
+def _parse_blob_fields(fields_param: Optional[str]) -> tuple:
+    """
+    Resolve ?fields= into the blob fields to return, ignoring unknown names
+    """
+    if not fields_param:
+        return DEFAULT_BLOB_FIELDS
+    requested = set(fields_param.split(','))
+    return tuple(field for field in BLOB_FIELDS if field == "name" or field in requested)
+
+
+def _project_blob(blob: BlobProperties, url_base: str, fields: tuple) -> dict:
+    """
+    Build the response entry for a listed blob with only the requested fields
+    """
+    entry = {"name": blob.name}
+    if "size" in fields:
+        entry["size"] = blob.size
+    if "last_modified" in fields:
+        entry["last_modified"] = blob.last_modified.isoformat() if blob.last_modified else None
+    if "content_type" in fields:
+        entry["content_type"] = blob.content_settings.content_type if blob.content_settings else None
+    if "url" in fields:
+        entry["url"] = url_base + blob.name
+    return entry
+
+
+async def _iter_blob_entries(container_client: ContainerClient, prefix: Optional[str], max_results: int, fields: tuple):
+    """
+    Yield response entries for up to max_results blobs one listing page at a time,
+    optionally under a name prefix
+    
+    Pages are sized to max_results (up to BLOB_PAGE_SIZE) so small listings take one round-trip.
+    """
+    remaining = max_results
+    url_base = container_client.url + "/"
+    pages = container_client.list_blobs(name_starts_with=prefix, results_per_page=min(max_results, BLOB_PAGE_SIZE)).by_page()
+    async with _storage_listing_semaphore:
+        async for page in pages:
+            entries = [_project_blob(blob, url_base, fields) async for blob in page][:remaining]
+            remaining -= len(entries)
+            yield entries
+            if remaining <= 0:
+                return
+
+
+async def _list_blobs(container_client: ContainerClient, prefix: Optional[str], max_results: int, fields: tuple) -> list:
+    """
+    List up to max_results blobs, optionally under a name prefix
+    """
+    blobs = []
+    async for entries in _iter_blob_entries(container_client, prefix, max_results, fields):
+        blobs += entries
+    return blobs
+
+
+async def _probe_blob_storage() -> None:
+    """
+    Fetch the account's SKU and kind, a small response whose cost does not grow with the account
+    """
+    blob_client = await get_shared_async_blob_service_client()
+    await blob_client.get_account_information()
+
+
 @utils_bp.route(route="utils/health", methods=["GET"])
 async def health_check(req: func.HttpRequest) -> func.HttpResponse:
     """
@@ -27,7 +145,7 @@ async def health_check(req: func.HttpRequest) -> func.HttpResponse:
         # Check various services
         health_status = {
             "status": "healthy",
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "timestamp": utc_now_iso(),
             "version": os.getenv("FUNCTIONS_EXTENSION_VERSION", "unknown"),
             "environment": os.getenv("AZURE_FUNCTIONS_ENVIRONMENT", "unknown"),
             "checks": {}
@@ -35,26 +153,27 @@ async def health_check(req: func.HttpRequest) -> func.HttpResponse:
         
         # Check blob storage connectivity
         try:
-            blob_client = get_blob_service_client()
-            # Simple test to list containers (should work even if no containers exist)
-            list(blob_client.list_containers(max_results=1))
+            await asyncio.wait_for(_probe_blob_storage(), timeout=HEALTH_CHECK_TIMEOUT_SECONDS)
             health_status["checks"]["blob_storage"] = "healthy"
+        except asyncio.TimeoutError:
+            health_status["checks"]["blob_storage"] = f"unhealthy: no response within {HEALTH_CHECK_TIMEOUT_SECONDS}s"
+            health_status["status"] = "degraded"
         except Exception as e:
             health_status["checks"]["blob_storage"] = f"unhealthy: {str(e)}"
             health_status["status"] = "degraded"
         
         return func.HttpResponse(
-            json.dumps(health_status, indent=2),
+            dumps_json(health_status, req),
             mimetype="application/json"
         )
         
     except Exception as e:
-        logging.error(f"Health check failed: {str(e)}")
+        logging.error("Health check failed: %s", e)
         return func.HttpResponse(
-            json.dumps({
+            orjson.dumps({
                 "status": "unhealthy",
                 "error": str(e),
-                "timestamp": datetime.now(timezone.utc).isoformat()
+                "timestamp": utc_now_iso()
             }),
             status_code=500,
             mimetype="application/json"
@@ -69,28 +188,27 @@ async def get_config_info(req: func.HttpRequest) -> func.HttpResponse:
     logging.info('Configuration info requested.')
     
     try:
-        # Return non-sensitive configuration info
-        config_info = {
-            "function_app_name": os.getenv("WEBSITE_SITE_NAME", "unknown"),
-            "resource_group": os.getenv("WEBSITE_RESOURCE_GROUP", "unknown"),
-            "subscription_id": os.getenv("WEBSITE_OWNER_NAME", "unknown").split("+")[0] if os.getenv("WEBSITE_OWNER_NAME") else "unknown",
-            "region": os.getenv("REGION_NAME", "unknown"),
-            "runtime_version": os.getenv("FUNCTIONS_EXTENSION_VERSION", "unknown"),
-            "python_version": os.getenv("FUNCTIONS_WORKER_RUNTIME_VERSION", "unknown"),
-            "timestamp": datetime.now(timezone.utc).isoformat()
-        }
+        if etag_matches(req, _CONFIG_INFO_ETAG):
+            return func.HttpResponse(status_code=304, headers={"ETag": _CONFIG_INFO_ETAG})
+        
+        timestamp = utc_now_iso()
+        if req.params.get('pretty') == '1':
+            body = dumps_json({**CONFIG_INFO, "timestamp": timestamp}, req)
+        else:
+            body = _CONFIG_INFO_PREFIX + b',"timestamp":"' + timestamp.encode() + b'"}'
         
         return func.HttpResponse(
-            json.dumps(config_info, indent=2),
+            body,
+            headers={"ETag": _CONFIG_INFO_ETAG},
             mimetype="application/json"
         )
         
     except Exception as e:
-        logging.error(f"Error getting config info: {str(e)}")
+        logging.error("Error getting config info: %s", e)
         return func.HttpResponse(
-            json.dumps({
+            orjson.dumps({
                 "error": str(e),
-                "timestamp": datetime.now(timezone.utc).isoformat()
+                "timestamp": utc_now_iso()
             }),
             status_code=500,
             mimetype="application/json"
@@ -105,31 +223,50 @@ async def list_storage_containers(req: func.HttpRequest) -> func.HttpResponse:
     logging.info('Storage containers list requested.')
     
     try:
-        blob_client = get_blob_service_client()
+        blob_client = await get_shared_async_blob_service_client()
         containers = []
         
-        for container in blob_client.list_containers():
-            containers.append({
-                "name": container.name,
-                "last_modified": container.last_modified.isoformat() if container.last_modified else None,
-                "metadata": container.metadata
-            })
+        # Container metadata is only requested from the service with ?include=metadata
+        include_metadata = req.params.get('include') == 'metadata'
+        
+        ndjson = req.params.get('format') == 'ndjson'
+        body = bytearray()
+        
+        async with _storage_listing_semaphore:
+            pages = blob_client.list_containers(include_metadata=include_metadata, results_per_page=CONTAINER_PAGE_SIZE).by_page()
+            async for page in pages:
+                async for container in page:
+                    entry = {
+                        "name": container.name,
+                        "last_modified": container.last_modified.isoformat() if container.last_modified else None
+                    }
+                    if include_metadata:
+                        entry["metadata"] = container.metadata
+                    if ndjson:
+                        # Serialize as each page arrives instead of holding every entry
+                        body += orjson.dumps(entry)
+                        body += b"\n"
+                    else:
+                        containers.append(entry)
+        
+        if ndjson:
+            return func.HttpResponse(bytes(body), mimetype="application/x-ndjson")
         
         return func.HttpResponse(
-            json.dumps({
+            dumps_json({
                 "containers": containers,
                 "count": len(containers),
-                "timestamp": datetime.now(timezone.utc).isoformat()
-            }, indent=2),
+                "timestamp": utc_now_iso()
+            }, req),
             mimetype="application/json"
         )
         
     except Exception as e:
-        logging.error(f"Error listing storage containers: {str(e)}")
+        logging.error("Error listing storage containers: %s", e)
         return func.HttpResponse(
-            json.dumps({
+            orjson.dumps({
                 "error": str(e),
-                "timestamp": datetime.now(timezone.utc).isoformat()
+                "timestamp": utc_now_iso()
             }),
             status_code=500,
             mimetype="application/json"
@@ -142,11 +279,11 @@ async def list_container_blobs(req: func.HttpRequest) -> func.HttpResponse:
     List blobs in a specific container
     """
     container_name = req.route_params.get('container_name')
-    logging.info(f'Blobs list requested for container: {container_name}')
+    logging.info('Blobs list requested for container: %s', container_name)
     
     if not container_name:
         return func.HttpResponse(
-            json.dumps({
+            orjson.dumps({
                 "error": "Container name is required"
             }),
             status_code=400,
@@ -154,43 +291,63 @@ async def list_container_blobs(req: func.HttpRequest) -> func.HttpResponse:
         )
     
     try:
-        blob_client = get_blob_service_client()
-        container_client = blob_client.get_container_client(container_name)
+        blob_client = await get_shared_async_blob_service_client()
+        container_client = _get_container_client(blob_client, container_name)
         
         # Get query parameters for pagination
         max_results = req.params.get('max_results', '100')
-        try:
-            max_results = int(max_results)
-        except ValueError:
-            max_results = 100
-        
-        blobs = []
-        for blob in container_client.list_blobs(max_results=max_results):
-            blobs.append({
-                "name": blob.name,
-                "size": blob.size,
-                "last_modified": blob.last_modified.isoformat() if blob.last_modified else None,
-                "content_type": blob.content_settings.content_type if blob.content_settings else None,
-                "url": f"{container_client.url}/{blob.name}"
-            })
+        max_results = int(max_results) if max_results.isdecimal() else 100
+        max_results = min(max(max_results, 1), MAX_BLOB_RESULTS)
+        
+        fields = _parse_blob_fields(req.params.get('fields'))
+        
+        # Optional comma-separated name prefixes, listed concurrently and merged
+        prefixes = [prefix for prefix in req.params.get('prefixes', '').split(',') if prefix]
+        
+        ndjson = req.params.get('format') == 'ndjson'
+        
+        if prefixes:
+            semaphore = asyncio.Semaphore(LISTING_SHARD_CONCURRENCY)
+            
+            async def list_shard(prefix: str) -> list:
+                async with semaphore:
+                    return await _list_blobs(container_client, prefix, max_results, fields)
+            
+            shards = await asyncio.gather(*[list_shard(prefix) for prefix in prefixes])
+            # Overlapping prefixes can return the same blob more than once
+            merged = {blob["name"]: blob for shard in shards for blob in shard}
+            blobs = [merged[name] for name in sorted(merged)][:max_results]
+            if ndjson:
+                body = b"".join(orjson.dumps(blob) + b"\n" for blob in blobs)
+                return func.HttpResponse(body, mimetype="application/x-ndjson")
+        elif ndjson:
+            # One JSON object per line, serialized page by page so entries are not all held at once
+            body = bytearray()
+            async for entries in _iter_blob_entries(container_client, None, max_results, fields):
+                for entry in entries:
+                    body += orjson.dumps(entry)
+                    body += b"\n"
+            return func.HttpResponse(bytes(body), mimetype="application/x-ndjson")
+        else:
+            blobs = await _list_blobs(container_client, None, max_results, fields)
         
         return func.HttpResponse(
-            json.dumps({
+            dumps_json({
                 "container": container_name,
                 "blobs": blobs,
                 "count": len(blobs),
-                "timestamp": datetime.now(timezone.utc).isoformat()
-            }, indent=2),
+                "timestamp": utc_now_iso()
+            }, req),
             mimetype="application/json"
         )
         
     except Exception as e:
-        logging.error(f"Error listing blobs in container {container_name}: {str(e)}")
+        logging.error("Error listing blobs in container %s: %s", container_name, e)
         return func.HttpResponse(
-            json.dumps({
+            orjson.dumps({
                 "error": str(e),
                 "container": container_name,
-                "timestamp": datetime.now(timezone.utc).isoformat()
+                "timestamp": utc_now_iso()
             }),
             status_code=500,
             mimetype="application/json"
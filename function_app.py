@@ -18,6 +18,9 @@ To add new functionality:
 
 import azure.functions as func
 import logging
+import orjson
+
+from shared.http_utils import dumps_json, etag_matches, make_etag, utc_now_iso
 
 # Import blueprints
 from blueprints.arxiv.functions import arxiv_bp
@@ -37,83 +40,94 @@ app.register_blueprint(news_bp)
 app.register_blueprint(utils_bp)
 app.register_blueprint(abstract_parse_bp)
 
+# Static part of the root endpoint response; only the timestamp changes per request
+API_INFO = {
+    "name": "DailyTech Azure Function App",
+    "description": "Multi-function app organized with blueprints",
+    "version": "2.0.0",
+    "architecture": "Blueprint-based organization",
+    "blueprints": {
+        "arxiv": {
+            "description": "arXiv RSS processing with batch upload (your original logic preserved)",
+            "endpoints": [
+                "POST /api/http_trigger_arxiv_rss - Start arXiv RSS processing",
+                "GET /api/arxiv/status/{instanceId} - Get processing status",
+                "POST /api/arxiv/mock/create - Create mock article for testing"
+            ],
+            "features": [
+                "Batch article upload with configurable concurrency",
+                "Async processing with proper error handling",
+                "RSS parsing and metadata extraction",
+                "Azure Blob Storage integration",
+                "Mock article creation for testing abstractParse"
+            ]
+        },
+        "news": {
+            "description": "News aggregation and processing functions (example)",
+            "endpoints": [
+                "GET /api/news/headlines?category={category}&country={country} - Get news headlines",
+                "GET /api/news/search?q={query} - Search news articles"
+            ],
+            "note": "Example blueprint - integrate with real news APIs"
+        },
+        "utils": {
+            "description": "Utility functions for health checks and administration",
+            "endpoints": [
+                "GET /api/utils/health - Health check",
+                "GET /api/utils/config - Configuration info",
+                "GET /api/utils/storage/containers - List storage containers",
+                "GET /api/utils/storage/container/{name}/blobs - List blobs in container"
+            ]
+        },
+        "abstractParse": {
+            "description": "Simplifies academic article descriptions using Azure OpenAI",
+            "endpoints": [
+                "POST /api/abstract/simplify - Simplify article description into easy-to-understand language"
+            ],
+            "input_format": {
+                "file_url": "Full URL to blob containing article metadata JSON"
+            },
+            "features": [
+                "Reads article metadata from Azure Blob Storage",
+                "Uses Azure OpenAI to translate complex academic language",
+                "Returns both original and simplified descriptions"
+            ]
+        }
+    },
+    "usage": {
+        "note": "All endpoints are protected with function-level authentication",
+        "auth_header": "x-functions-key",
+        "content_type": "application/json"
+    },
+    "migration_notes": {
+        "preserved": "All original arXiv functionality including batch upload is preserved",
+        "improved": "Better code organization with blueprints",
+        "scalable": "Easy to add new function groups without conflicts"
+    }
+}
+
+# Serialized once with the closing brace dropped so the timestamp can be appended
+_API_INFO_PREFIX = orjson.dumps(API_INFO)[:-1]
+_API_INFO_ETAG = make_etag(_API_INFO_PREFIX)
+
 # Root endpoint for API information
 @app.route(route="", methods=["GET"])
 async def api_info(req: func.HttpRequest) -> func.HttpResponse:
     """
     Root endpoint providing API information and available endpoints
     """
-    import json
-    from datetime import datetime, timezone
+    if etag_matches(req, _API_INFO_ETAG):
+        return func.HttpResponse(status_code=304, headers={"ETag": _API_INFO_ETAG})
     
-    api_info = {
-        "name": "DailyTech Azure Function App",
-        "description": "Multi-function app organized with blueprints",
-        "version": "2.0.0",
-        "timestamp": datetime.now(timezone.utc).isoformat(),
-        "architecture": "Blueprint-based organization",
-        "blueprints": {
-            "arxiv": {
-                "description": "arXiv RSS processing with batch upload (your original logic preserved)",
-                "endpoints": [
-                    "POST /api/http_trigger_arxiv_rss - Start arXiv RSS processing",
-                    "GET /api/arxiv/status/{instanceId} - Get processing status",
-                    "POST /api/arxiv/mock/create - Create mock article for testing"
-                ],
-                "features": [
-                    "Batch article upload with configurable concurrency",
-                    "Async processing with proper error handling",
-                    "RSS parsing and metadata extraction",
-                    "Azure Blob Storage integration",
-                    "Mock article creation for testing abstractParse"
-                ]
-            },
-            "news": {
-                "description": "News aggregation and processing functions (example)",
-                "endpoints": [
-                    "GET /api/news/headlines?category={category}&country={country} - Get news headlines",
-                    "GET /api/news/search?q={query} - Search news articles"
-                ],
-                "note": "Example blueprint - integrate with real news APIs"
-            },
-            "utils": {
-                "description": "Utility functions for health checks and administration",
-                "endpoints": [
-                    "GET /api/utils/health - Health check",
-                    "GET /api/utils/config - Configuration info",
-                    "GET /api/utils/storage/containers - List storage containers",
-                    "GET /api/utils/storage/container/{name}/blobs - List blobs in container"
-                ]
-            },
-            "abstractParse": {
-                "description": "Simplifies academic article descriptions using Azure OpenAI",
-                "endpoints": [
-                    "POST /api/abstract/simplify - Simplify article description into easy-to-understand language"
-                ],
-                "input_format": {
-                    "file_url": "Full URL to blob containing article metadata JSON"
-                },
-                "features": [
-                    "Reads article metadata from Azure Blob Storage",
-                    "Uses Azure OpenAI to translate complex academic language",
-                    "Returns both original and simplified descriptions"
-                ]
-            }
-        },
-        "usage": {
-            "note": "All endpoints are protected with function-level authentication",
-            "auth_header": "x-functions-key",
-            "content_type": "application/json"
-        },
-        "migration_notes": {
-            "preserved": "All original arXiv functionality including batch upload is preserved",
-            "improved": "Better code organization with blueprints",
-            "scalable": "Easy to add new function groups without conflicts"
-        }
-    }
+    timestamp = utc_now_iso()
+    if req.params.get('pretty') == '1':
+        body = dumps_json({**API_INFO, "timestamp": timestamp}, req)
+    else:
+        body = _API_INFO_PREFIX + b',"timestamp":"' + timestamp.encode() + b'"}'
     
     return func.HttpResponse(
-        json.dumps(api_info, indent=2),
+        body,
+        headers={"ETag": _API_INFO_ETAG},
         mimetype="application/json"
     )
 
@@ -124,15 +138,12 @@ async def quick_health(req: func.HttpRequest) -> func.HttpResponse:
     """
     Quick health check endpoint
     """
-    import json
-    from datetime import datetime, timezone
-    
     return func.HttpResponse(
-        json.dumps({
+        dumps_json({
             "status": "healthy",
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "timestamp": utc_now_iso(),
             "app": "DailyTech Function App v2.0",
             "note": "Use /api/utils/health for detailed health checks"
-        }),
+        }, req),
         mimetype="application/json"
     )
@@ -0,0 +1,53 @@
+"""
+Shared helpers for HTTP responses
+"""
+import hashlib
+import time
+from datetime import datetime, timezone
+from typing import Any, Optional
+import azure.functions as func
+import orjson
+
+# (epoch second, ISO string) of the last formatted timestamp, replaced as one tuple
+_cached_timestamp = (0, "")
+
+
+def dumps_json(data: Any, req: Optional[func.HttpRequest] = None) -> bytes:
+    """
+    Serialize a response body as compact JSON, or indented JSON when the request has ?pretty=1
+    """
+    if req is not None and req.params.get('pretty') == '1':
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return orjson.dumps(data)
+
+
+def utc_now_iso() -> str:
+    """
+    Current UTC time as an ISO 8601 string, at one-second resolution
+    
+    The string is formatted at most once per second and reused in between.
+    """
+    global _cached_timestamp
+    now = int(time.time())
+    cached_second, cached_iso = _cached_timestamp
+    if now != cached_second:
+        cached_iso = datetime.fromtimestamp(now, timezone.utc).isoformat()
+        _cached_timestamp = (now, cached_iso)
+    return cached_iso
+
+
+def make_etag(content: bytes) -> str:
+    """
+    Weak ETag for a response whose content is fixed apart from volatile fields like timestamps
+    """
+    return 'W/"' + hashlib.sha256(content).hexdigest()[:32] + '"'
+
+
+def etag_matches(req: func.HttpRequest, etag: str) -> bool:
+    """
+    Whether the request's If-None-Match header matches etag
+    """
+    if_none_match = req.headers.get('If-None-Match')
+    if not if_none_match:
+        return False
+    return any(tag.strip() in (etag, '*') for tag in if_none_match.split(','))
@@ -2,41 +2,141 @@
 Shared utilities for Azure Storage operations
 Contains only general storage functions, not domain-specific logic
 """
+import asyncio
+import atexit
 import os
+import re
 import logging
+import threading
+import aiohttp
+from typing import Optional, Set, Tuple, Union
+from urllib.parse import unquote, urldefrag, urlsplit
+from azure.core.exceptions import ResourceExistsError, ResourceNotFoundError
+from azure.core.pipeline.transport import AioHttpTransport
 from azure.storage.blob import BlobServiceClient
+from azure.storage.blob.aio import BlobClient as AsyncBlobClient
 from azure.storage.blob.aio import BlobServiceClient as AsyncBlobServiceClient
+from azure.storage.blob.aio import ContainerClient as AsyncContainerClient
 from azure.identity import DefaultAzureCredential
 from azure.identity.aio import DefaultAzureCredential as AsyncDefaultAzureCredential
 
+# Storage mode is fixed for the worker's lifetime, so the environment is read once:
+# Azurite for local development, RBAC against the account URL otherwise
+USE_AZURITE = os.environ.get('AzureWebJobsStorage') == "UseDevelopmentStorage=true"
+STORAGE_ACCOUNT_URL = os.environ.get('AZURE_STORAGE_ACCOUNT_URL')
+
+# Well-known Azurite development account
+_AZURITE_BLOB_ENDPOINT = "http://127.0.0.1:10000/devstoreaccount1"
+_AZURITE_CONNECTION_STRING = f"DefaultEndpointsProtocol=http;AccountName=devstoreaccount1;AccountKey=Eby8vdM02xNOcqFlqUwJPLlmEtlCDXJ1OUzFT50uSRZ6IFsuFq2UVErCz4I6tq/K1SZFPTOtr/KBHBeksoGMGw==;BlobEndpoint={_AZURITE_BLOB_ENDPOINT};"
+
+# URL fragment addressing a byte range inside a blob, e.g. ...articles.ndjson#bytes=0-1023
+_BYTE_RANGE_RE = re.compile(r'bytes=(\d+)-(\d+)')
+
+# Shared credentials for every sync and async client, so the credential chain is
+# walked and tokens are fetched once per worker rather than once per client
+_default_credential: Optional[DefaultAzureCredential] = None
+_async_default_credential: Optional[AsyncDefaultAzureCredential] = None
+
+# Process-wide BlobServiceClient; clients are thread-safe and share one connection pool
+_blob_service_client: Optional[BlobServiceClient] = None
+_blob_service_client_lock = threading.Lock()
+
+# Async counterpart, bound to the worker's event loop and reused across invocations
+_shared_async_blob_service_client: Optional[AsyncBlobServiceClient] = None
+
+# Containers this worker has created or found to exist, so their existence is not re-checked
+_ready_containers: Set[str] = set()
+
+# Async blob uploads in flight at once across the whole worker, whatever their caller
+AZURE_BLOB_MAX_CONCURRENCY = int(os.getenv('AZURE_BLOB_MAX_CONCURRENCY', '16'))
+_upload_semaphore = asyncio.Semaphore(AZURE_BLOB_MAX_CONCURRENCY)
+
+# Connection pool and timeouts for the shared async client's aiohttp transport
+STORAGE_CONNECTION_POOL_SIZE = int(os.getenv('AZURE_STORAGE_POOL_SIZE', '128'))
+STORAGE_DNS_CACHE_SECONDS = 300
+STORAGE_KEEPALIVE_SECONDS = 60
+STORAGE_CONNECTION_TIMEOUT_SECONDS = 5
+STORAGE_READ_TIMEOUT_SECONDS = 30
+STORAGE_DATA_BLOCK_SIZE = 64 * 1024
+
+# Block size for uploads the SDK splits into blocks: blobs over its 64 MiB single
+# Put Blob limit and streams of unknown length such as the raw RSS (SDK default 4 MiB)
+STORAGE_MAX_BLOCK_SIZE = int(os.getenv('AZURE_BLOB_CHUNK_SIZE', str(4 * 1024 * 1024)))
+
+
+def _get_default_credential() -> DefaultAzureCredential:
+    """
+    Get the shared DefaultAzureCredential, skipping developer-tool credentials that never apply here
+    """
+    global _default_credential
+    if _default_credential is None:
+        _default_credential = DefaultAzureCredential(
+            exclude_interactive_browser_credential=True,
+            exclude_shared_token_cache_credential=True,
+            exclude_visual_studio_code_credential=True
+        )
+    return _default_credential
+
+
+def _get_async_default_credential() -> AsyncDefaultAzureCredential:
+    """
+    Get the shared async DefaultAzureCredential, configured like the sync one
+    """
+    global _async_default_credential
+    if _async_default_credential is None:
+        _async_default_credential = AsyncDefaultAzureCredential(
+            exclude_shared_token_cache_credential=True,
+            exclude_visual_studio_code_credential=True
+        )
+    return _async_default_credential
+
 
 def get_blob_service_client() -> BlobServiceClient:
     """
-    Get BlobServiceClient - uses connection string for local development (Azurite) 
+    Get the shared BlobServiceClient - uses connection string for local development (Azurite) 
     and RBAC for cloud deployment
+    
+    The client is created once per worker process and reused by every caller, so
+    warm invocations skip credential setup and reuse pooled TCP/TLS connections.
+    BlobServiceClient is safe to share across threads.
+    """
+    global _blob_service_client
+    if _blob_service_client is not None:
+        return _blob_service_client
+    
+    with _blob_service_client_lock:
+        if _blob_service_client is None:
+            _blob_service_client = _create_blob_service_client()
+    return _blob_service_client
+
+
+def _create_blob_service_client() -> BlobServiceClient:
+    """
+    Create a new BlobServiceClient for the current environment
     """
     try:
         # Check if we're running locally with Azurite
-        azure_web_jobs_storage = os.environ.get('AzureWebJobsStorage')
-        if azure_web_jobs_storage and azure_web_jobs_storage == "UseDevelopmentStorage=true":
+        if USE_AZURITE:
             # Local development with Azurite
-            connection_string = "DefaultEndpointsProtocol=http;AccountName=devstoreaccount1;AccountKey=Eby8vdM02xNOcqFlqUwJPLlmEtlCDXJ1OUzFT50uSRZ6IFsuFq2UVErCz4I6tq/K1SZFPTOtr/KBHBeksoGMGw==;BlobEndpoint=http://127.0.0.1:10000/devstoreaccount1;"
-            blob_service_client = BlobServiceClient.from_connection_string(connection_string)
+            blob_service_client = BlobServiceClient.from_connection_string(
+                _AZURITE_CONNECTION_STRING,
+                max_block_size=STORAGE_MAX_BLOCK_SIZE
+            )
             logging.info("Using Azurite connection string for local development")
             return blob_service_client
         
         # Production/cloud environment - use RBAC
-        storage_account_url = os.environ.get('AZURE_STORAGE_ACCOUNT_URL')
-        if not storage_account_url:
+        if not STORAGE_ACCOUNT_URL:
             raise ValueError("AZURE_STORAGE_ACCOUNT_URL environment variable not found")
         
-        # Use DefaultAzureCredential for RBAC authentication
-        credential = DefaultAzureCredential()
+        # Use the shared DefaultAzureCredential for RBAC authentication
+        credential = _get_default_credential()
         
         # Create blob service client with managed identity
         blob_service_client = BlobServiceClient(
-            account_url=storage_account_url,
-            credential=credential
+            account_url=STORAGE_ACCOUNT_URL,
+            credential=credential,
+            max_block_size=STORAGE_MAX_BLOCK_SIZE
         )
         
         logging.info("Using Azure RBAC authentication for cloud deployment")
@@ -47,32 +147,162 @@ def get_blob_service_client() -> BlobServiceClient:
         raise e
 
 
-async def get_async_blob_service_client() -> AsyncBlobServiceClient:
+async def get_shared_async_blob_service_client() -> AsyncBlobServiceClient:
+    """
+    Get the shared AsyncBlobServiceClient, creating it on first use
+    
+    Unlike get_async_blob_service_client, callers must not close the returned
+    client; keeping it open keeps its connection pool and token warm.
+    """
+    global _shared_async_blob_service_client
+    if _shared_async_blob_service_client is None:
+        _shared_async_blob_service_client = await get_async_blob_service_client(
+            transport=_create_async_transport(),
+            max_block_size=STORAGE_MAX_BLOCK_SIZE
+        )
+    return _shared_async_blob_service_client
+
+
+def _create_async_transport() -> AioHttpTransport:
+    """
+    Create an aiohttp transport with a larger per-host pool, cached DNS lookups and
+    idle connections kept long enough to span consecutive activities
+    
+    aiohttp already sets TCP_NODELAY on its sockets, so small requests are not held back by Nagle.
+    Must be called from a running event loop.
+    """
+    connector = aiohttp.TCPConnector(
+        limit=STORAGE_CONNECTION_POOL_SIZE,
+        limit_per_host=STORAGE_CONNECTION_POOL_SIZE,
+        ttl_dns_cache=STORAGE_DNS_CACHE_SECONDS,
+        keepalive_timeout=STORAGE_KEEPALIVE_SECONDS,
+        enable_cleanup_closed=True
+    )
+    return AioHttpTransport(
+        # Same session settings azure-core uses for its own session: honour proxy
+        # environment variables, keep no cookies, and leave Content-Encoding to the
+        # SDK so download_blob(decompress=False) still gets the stored bytes
+        session=aiohttp.ClientSession(
+            connector=connector,
+            trust_env=True,
+            cookie_jar=aiohttp.DummyCookieJar(),
+            auto_decompress=False
+        ),
+        connection_timeout=STORAGE_CONNECTION_TIMEOUT_SECONDS,
+        read_timeout=STORAGE_READ_TIMEOUT_SECONDS,
+        connection_data_block_size=STORAGE_DATA_BLOCK_SIZE
+    )
+
+
+def _close_shared_async_blob_service_client():
+    """
+    Best-effort release of the shared async client's connections on worker shutdown
+    """
+    if _shared_async_blob_service_client is None:
+        return
+    try:
+        asyncio.run(_shared_async_blob_service_client.close())
+    except Exception as e:
+        logging.debug(f"Error closing shared async blob service client: {str(e)}")
+
+
+atexit.register(_close_shared_async_blob_service_client)
+
+
+def make_blob_range_url(blob_url: str, offset: int, length: int) -> str:
+    """
+    Build a URL that points at a byte range inside a blob
+    
+    The range is carried in the URL fragment, so the URL itself stays a valid blob URL.
+    """
+    return f"{blob_url}#bytes={offset}-{offset + length - 1}"
+
+
+def parse_blob_range_url(url: str) -> Tuple[str, Optional[int], Optional[int]]:
+    """
+    Split a URL from make_blob_range_url into (blob_url, offset, length)
+    
+    offset and length are None when the URL addresses the whole blob.
+    """
+    blob_url, fragment = urldefrag(url)
+    match = _BYTE_RANGE_RE.fullmatch(fragment)
+    if not match:
+        return blob_url, None, None
+    
+    start, end = int(match.group(1)), int(match.group(2))
+    return blob_url, start, end - start + 1
+
+
+def split_account_blob_url(blob_url: str) -> Tuple[str, str]:
+    """
+    Split a blob URL of the configured storage account into (container_name, blob_name)
+    
+    Raises ValueError for URLs with any other scheme, host or account, so
+    caller-supplied URLs can never direct this worker's credential elsewhere.
+    Query strings (e.g. SAS tokens) are ignored.
+    """
+    account_url = _AZURITE_BLOB_ENDPOINT if USE_AZURITE else STORAGE_ACCOUNT_URL
+    if not account_url:
+        raise ValueError("AZURE_STORAGE_ACCOUNT_URL environment variable not found")
+    
+    account = urlsplit(account_url)
+    url = urlsplit(blob_url)
+    account_path = account.path.rstrip('/') + '/'
+    if (url.scheme.lower() != account.scheme.lower()
+            or url.netloc.lower() != account.netloc.lower()
+            or not url.path.startswith(account_path)):
+        raise ValueError(f"Blob URL is not in the configured storage account: {blob_url}")
+    
+    container_name, _, blob_name = unquote(url.path[len(account_path):]).partition('/')
+    if not container_name or not blob_name:
+        raise ValueError(f"Invalid blob URL format: {blob_url}")
+    return container_name, blob_name
+
+
+async def get_shared_async_blob_client_from_url(blob_url: str) -> AsyncBlobClient:
+    """
+    Get an async BlobClient on the shared async client for a blob URL of the configured storage account
+    
+    Only the container and blob names are taken from the URL (see split_account_blob_url).
+    The client shares the worker's connection pool and credential, so callers must
+    not close it.
+    """
+    try:
+        container_name, blob_name = split_account_blob_url(blob_url)
+        blob_service_client = await get_shared_async_blob_service_client()
+        return blob_service_client.get_blob_client(container=container_name, blob=blob_name)
+        
+    except Exception as e:
+        logging.error(f"Error creating async blob client from URL: {str(e)}")
+        raise e
+
+
+async def get_async_blob_service_client(**client_kwargs) -> AsyncBlobServiceClient:
     """
     Get AsyncBlobServiceClient for concurrent operations
+    
+    Extra keyword arguments (e.g. transport) are passed through to the client.
     """
     try:
         # Check if we're running locally with Azurite
-        azure_web_jobs_storage = os.environ.get('AzureWebJobsStorage')
-        if azure_web_jobs_storage and azure_web_jobs_storage == "UseDevelopmentStorage=true":
+        if USE_AZURITE:
             # Local development with Azurite
-            connection_string = "DefaultEndpointsProtocol=http;AccountName=devstoreaccount1;AccountKey=Eby8vdM02xNOcqFlqUwJPLlmEtlCDXJ1OUzFT50uSRZ6IFsuFq2UVErCz4I6tq/K1SZFPTOtr/KBHBeksoGMGw==;BlobEndpoint=http://127.0.0.1:10000/devstoreaccount1;"
-            blob_service_client = AsyncBlobServiceClient.from_connection_string(connection_string)
+            blob_service_client = AsyncBlobServiceClient.from_connection_string(_AZURITE_CONNECTION_STRING, **client_kwargs)
             logging.info("Using Azurite connection string for async operations")
             return blob_service_client
         
         # Production/cloud environment - use RBAC
-        storage_account_url = os.environ.get('AZURE_STORAGE_ACCOUNT_URL')
-        if not storage_account_url:
+        if not STORAGE_ACCOUNT_URL:
             raise ValueError("AZURE_STORAGE_ACCOUNT_URL environment variable not found")
         
-        # Use DefaultAzureCredential for RBAC authentication
-        credential = AsyncDefaultAzureCredential()
+        # Use the shared DefaultAzureCredential for RBAC authentication
+        credential = _get_async_default_credential()
         
         # Create blob service client with managed identity
         blob_service_client = AsyncBlobServiceClient(
-            account_url=storage_account_url,
-            credential=credential
+            account_url=STORAGE_ACCOUNT_URL,
+            credential=credential,
+            **client_kwargs
         )
         
         logging.info("Using Azure RBAC authentication for async operations")
@@ -83,65 +313,103 @@ async def get_async_blob_service_client() -> AsyncBlobServiceClient:
         raise e
 
 
-def upload_blob_with_container_creation(blob_service_client: BlobServiceClient, container_name: str, blob_name: str, content: str) -> str:
+def ensure_container(blob_service_client: BlobServiceClient, container_name: str) -> None:
+    """
+    Create a container if it does not exist yet
+    
+    Skips the service call for containers already seen by this worker.
+    """
+    if container_name in _ready_containers:
+        return
+    try:
+        blob_service_client.get_container_client(container_name).create_container()
+        logging.info(f"Container '{container_name}' created successfully")
+    except ResourceExistsError:
+        pass
+    _ready_containers.add(container_name)
+
+
+def _forget_missing_container(error: Exception, container_name: str) -> None:
+    """
+    Drop a container from the ready set when the service reports it no longer exists,
+    so the next upload creates it again
+    """
+    if isinstance(error, ResourceNotFoundError) and getattr(error, "error_code", None) == "ContainerNotFound":
+        _ready_containers.discard(container_name)
+
+
+def upload_blob_with_container_creation(blob_service_client: BlobServiceClient, container_name: str, blob_name: str, content: Union[str, bytes]) -> str:
     """
     Upload content to blob storage with automatic container creation if needed
     """
     try:
+        ensure_container(blob_service_client, container_name)
         blob_client = blob_service_client.get_blob_client(
             container=container_name, 
             blob=blob_name
         )
-        
-        try:
-            blob_client.upload_blob(content, overwrite=True)
-        except Exception as upload_error:
-            # Check if container doesn't exist
-            if "The specified container does not exist" in str(upload_error):
-                logging.info(f"Container '{container_name}' does not exist. Creating it...")
-                container_client = blob_service_client.get_container_client(container_name)
-                container_client.create_container()
-                logging.info(f"Container '{container_name}' created successfully")
-                
-                # Retry the upload
-                blob_client.upload_blob(content, overwrite=True)
-            else:
-                raise upload_error
-        
+        blob_client.upload_blob(content, overwrite=True)
         return blob_client.url
         
     except Exception as e:
+        _forget_missing_container(e, container_name)
         logging.error(f"Error uploading blob {blob_name}: {str(e)}")
         raise e
 
 
-async def upload_blob_async(blob_service_client: AsyncBlobServiceClient, container_name: str, blob_name: str, content: str) -> str:
+async def ensure_container_async(blob_service_client: AsyncBlobServiceClient, container_name: str) -> None:
+    """
+    Create a container if it does not exist yet
+    
+    Skips the service call for containers already seen by this worker.
+    """
+    if container_name in _ready_containers:
+        return
+    try:
+        await blob_service_client.get_container_client(container_name).create_container()
+        logging.info(f"Container '{container_name}' created successfully")
+    except ResourceExistsError:
+        pass
+    _ready_containers.add(container_name)
+
+
+async def upload_blob_async(blob_service_client: AsyncBlobServiceClient, container_name: str, blob_name: str, content: Union[str, bytes], **upload_kwargs) -> str:
     """
     Upload content to blob storage asynchronously with automatic container creation if needed
+    
+    Extra keyword arguments are passed through to BlobClient.upload_blob.
     """
     try:
-        blob_client = blob_service_client.get_blob_client(
-            container=container_name, 
-            blob=blob_name
-        )
-        
-        try:
-            await blob_client.upload_blob(content, overwrite=True)
-        except Exception as upload_error:
-            # Check if container doesn't exist
-            if "The specified container does not exist" in str(upload_error):
-                logging.info(f"Container '{container_name}' does not exist. Creating it...")
-                container_client = blob_service_client.get_container_client(container_name)
-                await container_client.create_container()
-                logging.info(f"Container '{container_name}' created successfully")
-                
-                # Retry the upload
-                await blob_client.upload_blob(content, overwrite=True)
-            else:
-                raise upload_error
-        
+        await ensure_container_async(blob_service_client, container_name)
+        container_client = blob_service_client.get_container_client(container_name)
+        return await upload_blob_to_container_async(container_client, blob_name, content, **upload_kwargs)
+    except Exception as e:
+        logging.error(f"Error uploading blob {blob_name}: {str(e)}")
+        raise e
+
+
+async def upload_blob_to_container_async(container_client: AsyncContainerClient, blob_name: str, content: Union[str, bytes], skip_existing: bool = False, **upload_kwargs) -> str:
+    """
+    Upload content to a container that is known to exist
+    
+    Lets callers uploading many blobs build the ContainerClient once. Uploads wait
+    for a slot of the worker-wide AZURE_BLOB_MAX_CONCURRENCY limit. With
+    skip_existing the upload is sent with If-None-Match: * and an existing blob is
+    left as is. Extra keyword arguments are passed through to BlobClient.upload_blob.
+    
+    Failures are re-raised and logged only at debug level; the caller decides whether
+    a failure is final (and worth an error) or will be retried.
+    """
+    try:
+        blob_client = container_client.get_blob_client(blob_name)
+        async with _upload_semaphore:
+            await blob_client.upload_blob(content, overwrite=not skip_existing, **upload_kwargs)
         return blob_client.url
         
     except Exception as e:
-        logging.error(f"Error uploading blob {blob_name}: {str(e)}")
+        if skip_existing and isinstance(e, ResourceExistsError):
+            logging.debug("Blob %s already exists, skipping upload", blob_name)
+            return blob_client.url
+        _forget_missing_container(e, container_client.container_name)
+        logging.debug("Upload of blob %s failed: %s", blob_name, e)
         raise e
@@ -0,0 +1,136 @@
+"""
+Tests that articles written by the arXiv upload path can be read back by the abstract endpoint
+"""
+import orjson
+import re
+import unittest
+from unittest import mock
+from aiohttp import web
+from azure.storage.blob.aio import BlobServiceClient
+
+import shared.storage_utils as storage_utils
+from blueprints.abstractParse.functions import _download_article_metadata
+from blueprints.arxiv.batch_upload import encode_article
+from shared.storage_utils import make_blob_range_url
+
+ARTICLE = {
+    "identifier": "2203.01250v3",
+    "title": "A title",
+    "link": "https://arxiv.org/abs/2203.01250v3",
+    "description": "arXiv:2203.01250v3 Announce Type: replace Abstract: Something.",
+    "creator": "A. Author",
+    "doi": None
+}
+
+_RANGE_RE = re.compile(r'bytes=(\d+)-(\d+)')
+
+
+class FakeBlobServer:
+    """
+    Serves stored blob bytes with their Content-Encoding, honouring x-ms-range like Blob Storage
+    """
+    
+    def __init__(self):
+        self.blobs = {}
+        self.requested = []
+    
+    async def handle(self, request: web.Request) -> web.Response:
+        self.requested.append(request.path)
+        content, content_type, content_encoding = self.blobs[request.path]
+        headers = {
+            "Content-Type": content_type,
+            "x-ms-blob-type": "BlockBlob",
+            "ETag": '"0x1"',
+            "Last-Modified": "Mon, 14 Oct 2026 00:00:00 GMT"
+        }
+        if content_encoding:
+            headers["Content-Encoding"] = content_encoding
+        match = _RANGE_RE.fullmatch(request.headers.get("x-ms-range", ""))
+        if not match:
+            return web.Response(body=content, headers=headers)
+        start, end = int(match.group(1)), min(int(match.group(2)), len(content) - 1)
+        headers["Content-Range"] = f"bytes {start}-{end}/{len(content)}"
+        return web.Response(status=206, body=content[start:end + 1], headers=headers)
+
+
+class ArticleReadBackTest(unittest.IsolatedAsyncioTestCase):
+    
+    async def asyncSetUp(self):
+        self.server = FakeBlobServer()
+        app = web.Application()
+        app.router.add_get("/{tail:.*}", self.server.handle)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.base_url = f"http://127.0.0.1:{port}/devstoreaccount1/arxiv-data"
+        
+        # Point the shared client and the account check at the fake endpoint
+        endpoint = f"http://127.0.0.1:{port}/devstoreaccount1"
+        self.blob_service_client = BlobServiceClient.from_connection_string(
+            storage_utils._AZURITE_CONNECTION_STRING.replace(storage_utils._AZURITE_BLOB_ENDPOINT, endpoint)
+        )
+        for name, value in (
+            ("USE_AZURITE", True),
+            ("_AZURITE_BLOB_ENDPOINT", endpoint),
+            ("_shared_async_blob_service_client", self.blob_service_client)
+        ):
+            patcher = mock.patch.object(storage_utils, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+    
+    async def asyncTearDown(self):
+        await self.blob_service_client.close()
+        await self.runner.cleanup()
+    
+    async def test_reads_per_article_blob(self):
+        self.server.blobs["/devstoreaccount1/arxiv-data/cs.AI/articles/a.json"] = (
+            encode_article(ARTICLE), "application/json", "gzip"
+        )
+        
+        metadata = await _download_article_metadata(f"{self.base_url}/cs.AI/articles/a.json")
+        
+        self.assertEqual(metadata, ARTICLE)
+    
+    async def test_reads_plain_json_blob(self):
+        self.server.blobs["/devstoreaccount1/arxiv-data/cs.AI/articles/old.json"] = (
+            orjson.dumps(ARTICLE), "application/json", ""
+        )
+        
+        metadata = await _download_article_metadata(f"{self.base_url}/cs.AI/articles/old.json")
+        
+        self.assertEqual(metadata, ARTICLE)
+    
+    async def test_reads_packed_article_range(self):
+        other = dict(ARTICLE, identifier="2203.09999v1", title="Other")
+        first = encode_article(other, line_terminator=b"\n")
+        second = encode_article(ARTICLE, line_terminator=b"\n")
+        self.server.blobs["/devstoreaccount1/arxiv-data/cs.AI/articles.ndjson"] = (
+            first + second, "application/x-ndjson", "gzip"
+        )
+        
+        url = make_blob_range_url(f"{self.base_url}/cs.AI/articles.ndjson", len(first), len(second))
+        metadata = await _download_article_metadata(url)
+        
+        self.assertEqual(metadata, ARTICLE)
+    
+    async def test_rejects_urls_outside_the_storage_account(self):
+        self.server.blobs["/devstoreaccount1/arxiv-data/cs.AI/articles/a.json"] = (
+            encode_article(ARTICLE), "application/json", "gzip"
+        )
+        port = self.base_url.split(":")[2].split("/")[0]
+        foreign_urls = (
+            f"http://localhost:{port}/devstoreaccount1/arxiv-data/cs.AI/articles/a.json",
+            f"https://127.0.0.1:{port}/devstoreaccount1/arxiv-data/cs.AI/articles/a.json",
+            f"http://127.0.0.1:{port}/otheraccount/arxiv-data/cs.AI/articles/a.json"
+        )
+        
+        for url in foreign_urls:
+            with self.subTest(url=url):
+                self.assertIsNone(await _download_article_metadata(url))
+        self.assertEqual(self.server.requested, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+"""
+Tests for article uploads: skipping existing blobs and retrying transient failures
+"""
+import unittest
+from unittest import mock
+from azure.core.exceptions import HttpResponseError, ResourceExistsError
+
+import blueprints.arxiv.batch_upload as batch_upload
+import blueprints.arxiv.functions as arxiv_functions
+from blueprints.arxiv.batch_upload import _upload_blob_with_retry
+from shared.storage_utils import upload_blob_to_container_async
+
+
+class ExistingBlobClient:
+    """
+    Blob that already exists: conditional uploads are rejected with 409
+    """
+    
+    url = "https://account.blob.core.windows.net/arxiv-data/a.json"
+    
+    def __init__(self):
+        self.overwrite_flags = []
+    
+    async def upload_blob(self, content, overwrite=False, **upload_kwargs):
+        self.overwrite_flags.append(overwrite)
+        if not overwrite:
+            raise ResourceExistsError("The specified blob already exists.")
+
+
+class FakeContainerClient:
+    
+    container_name = "arxiv-data"
+    
+    def __init__(self, blob_client):
+        self.blob_client = blob_client
+    
+    def get_blob_client(self, blob_name):
+        return self.blob_client
+
+
+class UploadToContainerTest(unittest.IsolatedAsyncioTestCase):
+    
+    async def test_skip_existing_treats_conflict_as_success(self):
+        blob_client = ExistingBlobClient()
+        
+        url = await upload_blob_to_container_async(FakeContainerClient(blob_client), "a.json", b"{}", skip_existing=True)
+        
+        self.assertEqual(url, ExistingBlobClient.url)
+        self.assertEqual(blob_client.overwrite_flags, [False])
+    
+    async def test_overwrite_by_default(self):
+        blob_client = ExistingBlobClient()
+        
+        await upload_blob_to_container_async(FakeContainerClient(blob_client), "a.json", b"{}")
+        
+        self.assertEqual(blob_client.overwrite_flags, [True])
+    
+
+
+class UploadRetryTest(unittest.IsolatedAsyncioTestCase):
+    
+    async def test_unexpected_conflict_is_logged_and_raised(self):
+        class ConflictingBlobClient(ExistingBlobClient):
+            async def upload_blob(self, content, overwrite=False, **upload_kwargs):
+                raise ResourceExistsError("Conflict")
+        
+        with self.assertLogs(level="ERROR") as logs, self.assertRaises(ResourceExistsError):
+            await _upload_blob_with_retry(FakeContainerClient(ConflictingBlobClient()), "a.json", b"{}")
+        
+        self.assertIn("Error uploading blob a.json", logs.output[0])
+    
+    async def test_retried_throttling_is_not_logged_as_error(self):
+        class ThrottledOnceBlobClient(ExistingBlobClient):
+            attempts = 0
+            
+            async def upload_blob(self, content, overwrite=False, **upload_kwargs):
+                self.attempts += 1
+                if self.attempts == 1:
+                    error = HttpResponseError("Server busy")
+                    error.status_code = 503
+                    raise error
+        
+        blob_client = ThrottledOnceBlobClient()
+        with mock.patch.object(batch_upload.asyncio, "sleep", mock.AsyncMock()), \
+                self.assertNoLogs(level="ERROR"):
+            url = await _upload_blob_with_retry(FakeContainerClient(blob_client), "a.json", b"{}")
+        
+        self.assertEqual(url, ExistingBlobClient.url)
+        self.assertEqual(blob_client.attempts, 2)
+
+
+class ForcedRunTest(unittest.IsolatedAsyncioTestCase):
+    
+    async def _skip_existing_for(self, force: bool) -> bool:
+        articles = [({"identifier": "2203.01250v3"}, "2203.01250v3")]
+        
+        async def parse(rss_content):
+            return articles
+        
+        with mock.patch.object(arxiv_functions, "_parse_rss_off_loop", parse), \
+                mock.patch.object(arxiv_functions, "SKIP_EXISTING_ARTICLES", True), \
+                mock.patch.object(arxiv_functions, "batch_upload_articles_async", return_value=[]) as batch_upload:
+            await arxiv_functions.parse_and_store_articles(b"<rss/>", "2026-10-14", "cs.AI", force=force)
+        return batch_upload.call_args.kwargs["skip_existing"]
+    
+    async def test_regular_run_skips_existing_articles(self):
+        self.assertTrue(await self._skip_existing_for(force=False))
+    
+    async def test_forced_run_overwrites_articles(self):
+        self.assertFalse(await self._skip_existing_for(force=True))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,162 @@
+"""
+Tests for the conditional arXiv RSS fetch and when its validators are remembered
+"""
+import unittest
+from unittest import mock
+
+import blueprints.arxiv.functions as arxiv_functions
+
+VALIDATORS = {"etag": '"abc"', "last_modified": "Mon, 14 Oct 2026 00:00:00 GMT"}
+
+
+def _user_function(function_builder):
+    return function_builder._function.get_user_function()
+
+
+class FakeOrchestrationContext:
+    """
+    Records activity calls and answers them with canned results
+    """
+    
+    def __init__(self, input_data: dict, results: dict):
+        self._input = input_data
+        self._results = results
+        self.calls = []
+    
+    def get_input(self):
+        return self._input
+    
+    def call_activity(self, name: str, input_data: dict):
+        self.calls.append((name, input_data))
+        return self._results[name]
+    
+    def set_custom_status(self, status):
+        pass
+
+
+def _run_orchestrator(context: FakeOrchestrationContext):
+    # The durable decorator wraps the generator; drive the generator itself
+    orchestrator = _user_function(arxiv_functions.arxiv_orchestrator).orchestrator_function
+    orchestration = orchestrator(context)
+    result = None
+    try:
+        while True:
+            result = orchestration.send(result)
+    except StopIteration as stop:
+        return stop.value
+
+
+class FakeResponse:
+    
+    def __init__(self, status: int):
+        self.status = status
+        self.headers = {}
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        return False
+
+
+class ConditionalFetchTest(unittest.IsolatedAsyncioTestCase):
+    
+    async def asyncSetUp(self):
+        self.sent_headers = []
+        
+        async def open_rss_response(rss_url, headers=None):
+            self.sent_headers.append(headers)
+            return FakeResponse(304)
+        
+        async def read_rss_validators(blob_service_client, category):
+            return VALIDATORS
+        
+        async def get_client():
+            return mock.MagicMock()
+        
+        async def ensure_container(blob_service_client, container_name):
+            pass
+        
+        for name, replacement in (
+            ("_open_rss_response", open_rss_response),
+            ("read_rss_validators", read_rss_validators),
+            ("get_shared_async_blob_service_client", get_client),
+            ("ensure_container_async", ensure_container)
+        ):
+            patcher = mock.patch.object(arxiv_functions, name, replacement)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+    
+    async def test_sends_stored_validators(self):
+        result = await arxiv_functions.fetch_and_store_raw_rss("cs.AI", "2026-10-14")
+        
+        self.assertEqual(result, {"not_modified": True})
+        self.assertEqual(self.sent_headers, [{
+            "If-None-Match": VALIDATORS["etag"],
+            "If-Modified-Since": VALIDATORS["last_modified"]
+        }])
+    
+    async def test_force_skips_validators(self):
+        await arxiv_functions.fetch_and_store_raw_rss("cs.AI", "2026-10-14", force=True)
+        
+        self.assertEqual(self.sent_headers, [{}])
+
+
+class StoreValidatorsTest(unittest.TestCase):
+    
+    def _store_metadata(self, article_count: int, failed_count: int) -> mock.MagicMock:
+        with mock.patch.object(arxiv_functions, "store_metadata", return_value="meta-url"), \
+                mock.patch.object(arxiv_functions, "store_rss_validators") as store_rss_validators:
+            _user_function(arxiv_functions.store_metadata_activity)({
+                "article_count": article_count,
+                "failed_count": failed_count,
+                "process_date": "2026-10-14",
+                "category": "cs.AI",
+                "rss_validators": VALIDATORS
+            })
+        return store_rss_validators
+    
+    def test_complete_run_stores_validators(self):
+        self._store_metadata(100, 0).assert_called_once_with("cs.AI", VALIDATORS)
+    
+    def test_partly_failed_run_keeps_previous_validators(self):
+        self._store_metadata(95, 5).assert_not_called()
+    
+    def test_empty_run_keeps_previous_validators(self):
+        self._store_metadata(0, 0).assert_not_called()
+
+
+class OrchestratorTest(unittest.TestCase):
+    
+    def test_passes_force_and_failure_count_through(self):
+        context = FakeOrchestrationContext(
+            {"category": "cs.AI", "process_date": "2026-10-14", "force": True},
+            {
+                "fetch_arxiv_rss_activity": {"raw_blob_url": "raw-url", "validators": VALIDATORS},
+                "parse_and_store_articles_activity": {"article_count": 95, "failed_count": 5},
+                "store_metadata_activity": "meta-url"
+            }
+        )
+        
+        result = _run_orchestrator(context)
+        
+        calls = dict(context.calls)
+        self.assertTrue(calls["fetch_arxiv_rss_activity"]["force"])
+        self.assertTrue(calls["parse_and_store_articles_activity"]["force"])
+        self.assertEqual(calls["store_metadata_activity"]["failed_count"], 5)
+        self.assertEqual(result["articles_failed"], 5)
+    
+    def test_not_modified_ends_run(self):
+        context = FakeOrchestrationContext(
+            {"category": "cs.AI", "process_date": "2026-10-14"},
+            {"fetch_arxiv_rss_activity": {"not_modified": True}}
+        )
+        
+        result = _run_orchestrator(context)
+        
+        self.assertEqual(result["status"], "not_modified")
+        self.assertEqual([name for name, _ in context.calls], ["fetch_arxiv_rss_activity"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+"""
+Tests for parsing RSS off the event loop and falling back when the process pool fails
+"""
+import unittest
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from unittest import mock
+
+import blueprints.arxiv.functions as arxiv_functions
+
+RSS = b"<rss><channel><item><guid>oai:arXiv.org:2203.01250v3</guid><title>T</title></item></channel></rss>"
+
+
+class FakePool:
+    """
+    Process pool stand-in whose submitted futures fail with a given exception
+    """
+    
+    def __init__(self, error: Exception):
+        self.error = error
+        self.shutdown_calls = []
+    
+    def submit(self, fn, *args):
+        future = Future()
+        future.set_exception(self.error)
+        return future
+    
+    def shutdown(self, wait=True, cancel_futures=False):
+        self.shutdown_calls.append(cancel_futures)
+
+
+class ParseOffLoopTest(unittest.IsolatedAsyncioTestCase):
+    
+    def _use_pool(self, pool: FakePool):
+        for name, value in (("RSS_PARSE_WORKERS", 2), ("_parse_pool", pool)):
+            patcher = mock.patch.object(arxiv_functions, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+    
+    async def test_broken_pool_falls_back_to_thread(self):
+        pool = FakePool(BrokenProcessPool("worker died"))
+        self._use_pool(pool)
+        
+        articles = await arxiv_functions._parse_rss_off_loop(RSS)
+        
+        self.assertEqual([identifier for _, identifier in articles], ["2203.01250v3"])
+        self.assertIsNone(arxiv_functions._parse_pool)
+        self.assertEqual(pool.shutdown_calls, [False])
+    
+    async def test_parser_errors_propagate_and_keep_the_pool(self):
+        pool = FakePool(ValueError("bad feed"))
+        self._use_pool(pool)
+        
+        with self.assertRaises(ValueError):
+            await arxiv_functions._parse_rss_off_loop(RSS)
+        
+        self.assertIs(arxiv_functions._parse_pool, pool)
+        self.assertEqual(pool.shutdown_calls, [])
+
+
+if __name__ == "__main__":
+    unittest.main()